@@ -1,14 +1,17 @@
 import os
 import hashlib
+import json
 import requests
 from dotenv import load_dotenv
 from collections import defaultdict
 import logging
 import time
+import threading
 from typing import List, Dict, Any, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 load_dotenv()
 
@@ -19,7 +22,11 @@ MEMOS_TOKEN = os.getenv("MEMOS_ACCESS_TOKEN")
 DRY_RUN = False  # Set to False to actually delete duplicates
 MAX_RETRIES = 3
 PAGE_SIZE = 100
-RATE_LIMIT_DELAY = 0.1
+RATE_LIMIT_DELAY = 0.1  # Average spacing between API calls
+DELETE_WORKERS = 8  # Concurrent DELETE requests in live mode
+# Reuse the fetched memo list for this many seconds (0 disables the cache).
+# Handy for a dry run followed by a live run.
+CACHE_TTL = int(os.getenv("MEMOS_CACHE_TTL_SEC", "0"))
 
 # Setup logging
 logging.basicConfig(
@@ -30,12 +37,59 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """Thread-safe token bucket that caps calls per second.
+
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Shared by page fetches and the concurrent deletes
+_rate_limiter = TokenBucket(
+    1 / RATE_LIMIT_DELAY if RATE_LIMIT_DELAY > 0 else 0,
+    burst=DELETE_WORKERS,
+)
+
+
 
 def extract_date(timestamp_str):
     """Extract just the date (YYYY-MM-DD) from ISO timestamp."""
+    if not timestamp_str:
+        return "unknown"
+
+    # Fast path: Memos emits ISO-8601, whose first 10 chars are the date
+    if (
+        len(timestamp_str) >= 10
+        and timestamp_str[4] == "-"
+        and timestamp_str[7] == "-"
+    ):
+        return timestamp_str[:10]
+
     try:
-        if not timestamp_str:
-            return "unknown"
         dt = datetime.fromisoformat(
             timestamp_str.replace('Z', '+00:00')
         )
@@ -51,9 +105,12 @@ def create_session_with_retries() -> requests.Session:
         total=MAX_RETRIES,
         backoff_factor=1,
         status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST", "PATCH"],
+        allowed_methods=["GET", "POST", "PATCH", "DELETE"],
+    )
+    # Larger keep-alive pool than the default of 10
+    adapter = HTTPAdapter(
+        pool_connections=32, pool_maxsize=32, max_retries=retry_strategy
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
@@ -79,6 +136,7 @@ def fetch_all_memos(
             if page_token:
                 params["pageToken"] = page_token
 
+            _rate_limiter.acquire()
             response = session.get(
                 f"{source_url.rstrip('/')}/api/v1/memos",
                 params=params,
@@ -87,7 +145,7 @@ def fetch_all_memos(
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = json.loads(response.content)
             memos = data.get("memos", [])
 
             if not memos:
@@ -103,8 +161,6 @@ def fetch_all_memos(
             if not page_token:
                 break
 
-            time.sleep(RATE_LIMIT_DELAY)
-
         logger.info(f"✅ Found {len(all_memos)} total memos\n")
         return all_memos
 
@@ -113,43 +169,119 @@ def fetch_all_memos(
         return []
 
 
+def content_signature(content, resources):
+    """Build a hashable, order-independent key for content + attachments."""
+    # frozenset ignores attachment order without sorting
+    resource_pairs = [
+        (
+            res.get("filename") or res.get("name") or "unknown",
+            res.get("type", "unknown"),
+        )
+        for res in resources
+    ]
+    resource_key = frozenset(resource_pairs)
+    if len(resource_key) != len(resource_pairs):
+        # Repeated pairs would collapse in a set; keep the multiplicity
+        resource_key = tuple(sorted(resource_pairs))
+
+    # Short content is its own key; long content is digested
+    if len(content) > 256:
+        content = hashlib.blake2b(
+            content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+    return content, resource_key
+
+
+def get_cache_file() -> str:
+    """Cache path keyed by instance and token, without storing the token."""
+    key = hashlib.blake2b(
+        f"{MEMOS_URL}|{MEMOS_TOKEN}".encode(), digest_size=6
+    ).hexdigest()
+    return f".memos_cache_{key}.json"
+
+
+def load_cached_memos() -> Optional[List[Dict[str, Any]]]:
+    """Return the cached memo list if it is younger than CACHE_TTL."""
+    cache_file = get_cache_file()
+    if not CACHE_TTL or not os.path.exists(cache_file):
+        return None
+
+    age = time.time() - os.path.getmtime(cache_file)
+    if age > CACHE_TTL:
+        return None
+
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            memos = json.load(f)
+        logger.info(
+            f"♻️  Using cached memo list ({len(memos)} memos, {age:.0f}s old)\n"
+        )
+        return memos
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️  Ignoring unreadable cache {cache_file}: {e}")
+        return None
+
+
+def save_cached_memos(memos: List[Dict[str, Any]]) -> None:
+    """Write the memo list to the cache file atomically."""
+    if not CACHE_TTL:
+        return
+
+    cache_file = get_cache_file()
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(memos, f)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"⚠️  Could not write cache {cache_file}: {e}")
+
+
+def invalidate_cached_memos() -> None:
+    """Drop the cache once memos have been deleted from the server."""
+    try:
+        os.remove(get_cache_file())
+    except FileNotFoundError:
+        pass
+
+
 def find_duplicates(memos):
     """Group memos by content hash AND date to find duplicates."""
     print("🔎 Analyzing memos for duplicates (by content + date)...\n")
 
-    # Group memos by content hash + date
-    content_date_groups = defaultdict(list)
+    # First pass: bucket by cheap attributes. Memos that are alone in
+    # their bucket cannot have a duplicate, so they are never hashed.
+    buckets = defaultdict(list)
+    # Bound once; this loop runs for every memo on the instance
+    bucket_for = buckets.__getitem__
 
     for memo in memos:
-        content = memo.get("content", "") or ""
-        resources = memo.get("attachments") or []
+        get = memo.get
+        content = get("content", "") or ""
+        resources = get("attachments") or []
         
         # Skip only if BOTH content and resources are empty
         if not content and not resources:
             continue
 
-        # Create resource signature to include in hash
-        # We sort resources to ensure order doesn't affect hash
-        resource_sigs = []
-        for res in resources:
-            res_name = res.get("filename") or res.get("name") or "unknown"
-            res_type = res.get("type", "unknown")
-            resource_sigs.append(f"{res_name}:{res_type}")
-        
-        resource_string = "|".join(sorted(resource_sigs))
-        
-        # Combine content + resources for uniqueness
-        unique_string = f"{content}||{resource_string}"
-
         # Get date from createTime
-        create_time = memo.get("createTime", "")
-        date = extract_date(create_time)
-        
-        # Create composite key: content_hash + date
-        content_hash = hashlib.md5(unique_string.encode()).hexdigest()
-        composite_key = f"{content_hash}_{date}"
-        
-        content_date_groups[composite_key].append(memo)
+        date = extract_date(get("createTime", ""))
+
+        bucket_for((len(content), len(resources), date)).append(
+            (memo, content, resources)
+        )
+
+    # Second pass: group memos by content hash + date
+    content_date_groups = defaultdict(list)
+
+    for (_, _, date), bucket in buckets.items():
+        if len(bucket) < 2:
+            continue
+
+        for memo, content, resources in bucket:
+            # Composite key: (content, resources, date)
+            content_key, resource_key = content_signature(content, resources)
+            content_date_groups[(content_key, resource_key, date)].append(memo)
 
     # Filter to only groups with duplicates
     duplicates = {
@@ -174,9 +306,7 @@ def find_duplicates(memos):
     for idx, (composite_key, memo_list) in enumerate(
         list(duplicates.items())[:display_limit], 1
     ):
-        # Extract date from composite key
-        # Extract date from composite key
-        date = composite_key.split('_')[-1]
+        date = composite_key[-1]
         
         memo_content = memo_list[0].get("content", "")
         memo_resources = memo_list[0].get("attachments") or []
@@ -212,7 +342,18 @@ def find_duplicates(memos):
     return duplicates
 
 
-def delete_duplicates(duplicates):
+def delete_memo(memo_name, session: requests.Session, headers):
+    """Delete a single memo, raising on HTTP errors."""
+    _rate_limiter.acquire()
+    response = session.delete(
+        f"{MEMOS_URL}/api/v1/{memo_name}",
+        headers=headers,
+        timeout=30,
+    )
+    response.raise_for_status()
+
+
+def delete_duplicates(duplicates, session: requests.Session):
     """Delete duplicate memos, keeping the oldest one in each set."""
     if not duplicates:
         return
@@ -232,51 +373,59 @@ def delete_duplicates(duplicates):
             print("❌ Deletion cancelled.\n")
             return
 
-    headers = {"Authorization": f"Bearer {MEMOS_TOKEN}"}
     deleted_count = 0
     failed_count = 0
 
-    for idx, (composite_key, memo_list) in enumerate(
-        duplicates.items(), 1
-    ):
+    # Keep first (oldest) of each set, delete the rest
+    to_delete = []
+    for composite_key, memo_list in duplicates.items():
         # Sort by create time to keep the oldest
         memo_list.sort(key=lambda x: x.get("createTime", ""))
 
-        date = composite_key.split('_')[-1]
-        
-        # Keep first (oldest), delete the rest
+        date = composite_key[-1]
         for memo in memo_list[1:]:
-            memo_name = memo.get("name")
-            content = memo.get("content", "")
-            preview = content[:50].replace("\n", " ") if content else "[No Text]"
+            to_delete.append((memo, date))
 
-            if DRY_RUN:
-                print(f"[DRY RUN] Would delete: {memo_name}")
-                print(f"  Date: {date}")
-                print(f"  Content: {preview}...")
-                deleted_count += 1
-            else:
+    def describe(memo, date):
+        content = memo.get("content", "")
+        preview = content[:50].replace("\n", " ") if content else "[No Text]"
+        print(f"  Date: {date}")
+        print(f"  Content: {preview}...")
+
+    if DRY_RUN:
+        for memo, date in to_delete:
+            print(f"[DRY RUN] Would delete: {memo.get('name')}")
+            describe(memo, date)
+            deleted_count += 1
+    else:
+        headers = {"Authorization": f"Bearer {MEMOS_TOKEN}"}
+
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    delete_memo, memo.get("name"), session, headers
+                ): (memo, date)
+                for memo, date in to_delete
+            }
+
+            for idx, future in enumerate(as_completed(futures), 1):
+                memo, date = futures[future]
+                memo_name = memo.get("name")
                 try:
-                    response = requests.delete(
-                        f"{MEMOS_URL}/api/v1/{memo_name}",
-                        headers=headers,
-                        timeout=30,
-                    )
-                    response.raise_for_status()
+                    future.result()
                     print(f"✅ Deleted: {memo_name}")
-                    print(f"  Date: {date}")
-                    print(f"  Content: {preview}...")
+                    describe(memo, date)
                     deleted_count += 1
                 except Exception as e:
                     print(f"❌ Failed to delete {memo_name}: {e}")
                     failed_count += 1
 
-        # Progress indicator
-        if idx % 10 == 0:
-            print(
-                f"\n  Progress: {idx}/{len(duplicates)} "
-                f"sets processed\n"
-            )
+                # Progress indicator
+                if idx % 10 == 0:
+                    print(
+                        f"\n  Progress: {idx}/{len(to_delete)} "
+                        f"memos processed\n"
+                    )
 
     print(f"\n{'='*60}")
     print(f"📊 SUMMARY")
@@ -307,8 +456,12 @@ def main():
     session = create_session_with_retries()
     
     try:
-        # Fetch all memos
-        memos = fetch_all_memos(MEMOS_URL, MEMOS_TOKEN, session)
+        # Fetch all memos (or reuse a recent snapshot)
+        memos = load_cached_memos()
+        if memos is None:
+            memos = fetch_all_memos(MEMOS_URL, MEMOS_TOKEN, session)
+            if memos:
+                save_cached_memos(memos)
         if not memos:
             print("❌ No memos fetched. Cannot continue.\n")
             return
@@ -318,7 +471,11 @@ def main():
 
         # Delete duplicates (or show what would be deleted)
         if duplicates:
-            delete_duplicates(duplicates)
+            delete_duplicates(duplicates, session)
+
+            if not DRY_RUN:
+                # The snapshot no longer matches the server
+                invalidate_cached_memos()
 
             if DRY_RUN:
                 print("💡 To actually delete duplicates, set DRY_RUN = False")
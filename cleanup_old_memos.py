@@ -1,10 +1,14 @@
 import requests
 import os
+import sys
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, timezone
 import time
+import random
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterator
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -21,6 +25,7 @@ DRY_RUN = False  # Set to False to actually delete
 PAGE_SIZE = 100
 RATE_LIMIT_DELAY = 0.1
 MAX_RETRIES = 3
+DELETE_WORKERS = 8  # Concurrent DELETE requests in live mode
 
 # Setup logging
 logging.basicConfig(
@@ -31,28 +36,93 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """Thread-safe token bucket that caps calls per second."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Keeps concurrent deletes within RATE_LIMIT_DELAY's average budget
+_rate_limiter = TokenBucket(1 / RATE_LIMIT_DELAY, burst=DELETE_WORKERS)
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, including a trailing 'Z'."""
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def format_ts(ts: float) -> str:
+    """Format a Unix timestamp as a UTC date for log lines."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JitteredRetry(Retry):
+    """Retry whose backoff is randomized so clients don't retry in lockstep."""
+
+    def get_backoff_time(self) -> float:
+        return super().get_backoff_time() * random.uniform(0.5, 1.5)
+
 
 def create_session_with_retries() -> requests.Session:
     """Create a requests session with automatic retries."""
     session = requests.Session()
-    retry_strategy = Retry(
+    retry_strategy = JitteredRetry(
         total=MAX_RETRIES,
         backoff_factor=1,
         status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST", "PATCH"],
+        allowed_methods=["GET", "POST", "PATCH", "DELETE"],
+        respect_retry_after_header=True,
+    )
+    # Pool sized above DELETE_WORKERS so connections are reused, not reopened
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=32,
+        pool_maxsize=32,
+        pool_block=False,
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
 
-def fetch_all_memos(
-    source_url: str, source_token: str, session: requests.Session
-) -> List[Dict[str, Any]]:
-    """Fetch all memos from source instance with pagination."""
+def iter_all_memos(
+    source_url: str,
+    source_token: str,
+    session: requests.Session,
+    filter_expr: Optional[str] = None,
+    order_by: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield memos from source instance page by page.
+
+    filter_expr is passed to the server as a CEL filter and order_by as
+    the sort order. Servers that reject them (HTTP 400 on the first
+    page) are paged without either. Request errors are re-raised, so a
+    partial listing is never mistaken for a complete one.
+    """
     logger.info("🔍 Fetching all memos from source instance...")
-    all_memos = []
+    total = 0
     page_token = None
     page_count = 0
     max_pages = 1000
@@ -66,6 +136,10 @@ def fetch_all_memos(
             params = {"pageSize": PAGE_SIZE}
             if page_token:
                 params["pageToken"] = page_token
+            if filter_expr:
+                params["filter"] = filter_expr
+            if order_by:
+                params["orderBy"] = order_by
 
             response = session.get(
                 f"{source_url.rstrip('/')}/api/v1/memos",
@@ -73,6 +147,19 @@ def fetch_all_memos(
                 headers=headers,
                 timeout=30,
             )
+            if (
+                response.status_code == 400
+                and (filter_expr or order_by)
+                and page_count == 1
+            ):
+                logger.warning(
+                    "⚠️  Server rejected the date filter or sort order, "
+                    "fetching all memos"
+                )
+                filter_expr = None
+                order_by = None
+                page_count = 0
+                continue
             response.raise_for_status()
 
             data = response.json()
@@ -81,11 +168,12 @@ def fetch_all_memos(
             if not memos:
                 break
 
-            all_memos.extend(memos)
+            total += len(memos)
             logger.info(
                 f"  📄 Page {page_count}: {len(memos)} memos "
-                f"(total: {len(all_memos)})"
+                f"(total: {total})"
             )
+            yield from memos
 
             page_token = data.get("nextPageToken")
             if not page_token:
@@ -93,12 +181,11 @@ def fetch_all_memos(
 
             time.sleep(RATE_LIMIT_DELAY)
 
-        logger.info(f"✅ Found {len(all_memos)} total memos\n")
-        return all_memos
+        logger.info(f"✅ Found {total} total memos\n")
 
     except requests.exceptions.RequestException as e:
         logger.error(f"❌ Error fetching memos: {e}")
-        return []
+        raise
 
 
 def delete_memo(memo_name, memo_id, session):
@@ -112,6 +199,7 @@ def delete_memo(memo_name, memo_id, session):
         url = f"{MEMOS_URL}/api/v1/memos/{memo_id}"
     
     try:
+        _rate_limiter.acquire()
         response = session.delete(url, headers=headers)
         return response.status_code == 200
     except Exception as e:
@@ -135,66 +223,106 @@ def main():
     
     # Parse cutoff date
     try:
-        cutoff_dt = datetime.fromisoformat(
-            CUTOFF_DATE.replace("Z", "+00:00")
-        )
+        cutoff_dt = parse_iso_datetime(CUTOFF_DATE)
     except Exception as e:
         print(f"❌ Invalid cutoff date format: {e}")
         return
+    # A cutoff without an offset means UTC, not this machine's local time
+    if cutoff_dt.tzinfo is None:
+        cutoff_dt = cutoff_dt.replace(tzinfo=timezone.utc)
     
     # Create session
     session = create_session_with_retries()
     
     try:
-        # Fetch all memos
+        # Filter memos before cutoff date as pages stream in; only the
+        # small records of memos to delete are kept in memory. Deletion
+        # waits until paging is done, since deleting shifts later pages.
         print("📥 Fetching all memos...\n")
-        memos = fetch_all_memos(MEMOS_URL, MEMOS_TOKEN, session)
-        
-        if not memos:
-            print("No memos found. Exiting.")
-            return
-    
-        # Filter memos before cutoff date
+        # (name, id, created Unix time) per memo; dates are only formatted
+        # when printed, and content is kept for the preview lines alone
         memos_to_delete = []
+        preview = []
+        seen_any = False
+        handle_prefix = (
+            f"@{FILTER_HANDLE.strip().lstrip('@')}" if FILTER_HANDLE else None
+        )
         
-        for memo in memos:
-            create_time = memo.get("createTime") or memo.get("createdTs")
+        # Let the server drop memos at/after the cutoff; the client-side
+        # check below stays authoritative in case the filter is ignored
+        cutoff_ts = cutoff_dt.timestamp()
+        cutoff_filter = f"created_ts < {int(cutoff_ts)}"
+        # Oldest first, so paging can stop at the first memo past the
+        # cutoff. The order is only trusted once it has been seen to rise
+        # and never fall; servers that ignore orderBy are walked in full.
+        ascending = True
+        rising = False
+        prev_ts = None
+        # A failed page ends the run: deleting from a partial listing
+        # would act on an incomplete picture of the instance
+        try:
+            for memo in iter_all_memos(
+                MEMOS_URL, MEMOS_TOKEN, session, cutoff_filter, "create_time asc"
+            ):
+                seen_any = True
+                create_time = memo.get("createTime") or memo.get("createdTs")
             
-            if not create_time:
-                continue
+                if not create_time:
+                    continue
             
-            # Filter by handle if configured
-            if FILTER_HANDLE:
-                clean_handle = FILTER_HANDLE.strip().lstrip("@")
-                if not memo.get("content", "").startswith(f"@{clean_handle}"):
-                    # Skip memos that don't start with the handle
+                # Handle both ISO string and Unix timestamp; everything is
+                # compared as Unix time, so numbers need no conversion
+                try:
+                    if isinstance(create_time, str):
+                        if create_time.isdigit():
+                            memo_ts = int(create_time)
+                        else:
+                            memo_ts = parse_iso_datetime(create_time).timestamp()
+                    else:
+                        memo_ts = create_time
+                
+                    if prev_ts is not None:
+                        if memo_ts < prev_ts:
+                            ascending = False
+                        elif memo_ts > prev_ts:
+                            rising = True
+                    prev_ts = memo_ts
+
+                    if memo_ts >= cutoff_ts:
+                        if ascending and rising:
+                            print("⏹️  Reached the cutoff date, stopping early\n")
+                            break
+                        continue
+
+                    # Filter by handle if configured
+                    if handle_prefix:
+                        if not memo.get("content", "").startswith(handle_prefix):
+                            # Skip memos that don't start with the handle
+                            continue
+
+                    memos_to_delete.append((
+                        memo.get("name"),
+                        memo.get("id") or memo.get("uid"),
+                        memo_ts,
+                    ))
+                    if len(preview) < 10:
+                        preview.append((memo_ts, memo.get("content", "")[:50]))
+                except Exception as e:
+                    print(f"⚠️  Skipping memo due to date parsing error: {e}")
                     continue
+        except requests.exceptions.RequestException:
+            print("❌ Memo listing failed part-way, nothing was deleted.")
+            return
+
+        if not seen_any:
+            print("No memos found. Exiting.")
+            return
 
-            # Handle both ISO string and Unix timestamp
-            try:
-                if isinstance(create_time, str):
-                    memo_dt = datetime.fromisoformat(
-                        create_time.replace("Z", "+00:00")
-                    )
-                else:
-                    memo_dt = datetime.fromtimestamp(create_time)
-                
-                if memo_dt < cutoff_dt:
-                    memos_to_delete.append({
-                        "name": memo.get("name"),
-                        "id": memo.get("id") or memo.get("uid"),
-                        "content": memo.get("content", "")[:50],
-                        "date": memo_dt.strftime("%Y-%m-%d %H:%M:%S")
-                    })
-            except Exception as e:
-                print(f"⚠️  Skipping memo due to date parsing error: {e}")
-                continue
-        
         # Show summary
         print(f"📊 Found {len(memos_to_delete)} memos to delete:\n")
         
-        for i, memo in enumerate(memos_to_delete[:10], 1):
-            print(f"  {i}. [{memo['date']}] {memo['content']}...")
+        for i, (memo_ts, content) in enumerate(preview, 1):
+            print(f"  {i}. [{format_ts(memo_ts)}] {content}...")
         
         if len(memos_to_delete) > 10:
             print(f"  ... and {len(memos_to_delete) - 10} more")
@@ -209,19 +337,31 @@ def main():
         deleted_count = 0
         failed_count = 0
         
-        for i, memo in enumerate(memos_to_delete, 1):
-            print(f"[{i}/{len(memos_to_delete)}] ", end="")
-            
-            if DRY_RUN:
-                print(f"Would delete: [{memo['date']}] {memo['content']}...")
+        if DRY_RUN:
+            for i, (name, memo_id, memo_ts) in enumerate(memos_to_delete, 1):
+                print(f"[{i}/{len(memos_to_delete)}] ", end="")
+                print(
+                    f"Would delete: [{format_ts(memo_ts)}] "
+                    f"{name or memo_id}"
+                )
                 deleted_count += 1
-            else:
-                if delete_memo(memo['name'], memo['id'], session):
-                    print(f"✅ Deleted: [{memo['date']}]")
-                    deleted_count += 1
-                else:
-                    print(f"❌ Failed: [{memo['date']}]")
-                    failed_count += 1
+        else:
+            # Deletes are independent; run them over the pooled session
+            with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+                results = executor.map(
+                    lambda m: delete_memo(m[0], m[1], session),
+                    memos_to_delete,
+                )
+                for i, ((_, _, memo_ts), ok) in enumerate(
+                    zip(memos_to_delete, results), 1
+                ):
+                    print(f"[{i}/{len(memos_to_delete)}] ", end="")
+                    if ok:
+                        print(f"✅ Deleted: [{format_ts(memo_ts)}]")
+                        deleted_count += 1
+                    else:
+                        print(f"❌ Failed: [{format_ts(memo_ts)}]")
+                        failed_count += 1
         
         # Final summary
         print("\n" + "=" * 60)
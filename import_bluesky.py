@@ -1,10 +1,20 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from atproto import Client, models
 import time
 import os
+import random
 from dotenv import load_dotenv
+from datetime import datetime
 import base64
-import mimetypes
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict
+from itertools import repeat
 
 # Load configuration from .env file
 load_dotenv()
@@ -14,10 +24,127 @@ MEMOS_URL = os.getenv("MEMOS_HOST")
 MEMOS_TOKEN = os.getenv("MEMOS_ACCESS_TOKEN")
 BSKY_HANDLE = os.getenv("BLUESKY_HANDLE")
 BSKY_PASSWORD = os.getenv("BLUESKY_PASSWORD")
-PAGINATION_DELAY = 1.0
+PAGINATION_DELAY = 0
 MAX_RETRIES = 3
+IMAGE_WORKERS = int(os.getenv("BLUESKY_IMAGE_WORKERS", "8"))
+# Memos/comments created concurrently
+ROOT_WORKERS = int(os.getenv("BLUESKY_IMPORT_WORKERS", "6"))
+# Max memo/comment creations per second
+MEMOS_RATE_LIMIT = float(os.getenv("BLUESKY_IMPORT_RATE", "5"))
+# Records created memos/comments so an interrupted import can resume
+CHECKPOINT_FILE = "import_state.json"
+# Maps (memo, image CID) -> attachment so re-runs skip uploaded images
+ATTACHMENTS_DB = "attachments.db"
+# Send attachments as raw multipart/form-data instead of base64 JSON.
+# Only enable this if your Memos server accepts multipart uploads.
+USE_MULTIPART = os.getenv("MEMOS_MULTIPART_UPLOAD", "false").lower() == "true"
+# Set to DEBUG to see per-image and per-request detail
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 # ---------------------
 
+# Setup logging
+logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# Embed model classes, bound once for the hot loop in get_bsky_posts
+_ImagesMain = models.AppBskyEmbedImages.Main
+_RecordWithMediaMain = models.AppBskyEmbedRecordWithMedia.Main
+
+# The Bluesky CDN only serves a handful of image types
+_EXT_MIME = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+}
+
+MEMOS_HEADERS = {
+    "Authorization": f"Bearer {MEMOS_TOKEN}",
+    "Content-Type": "application/json",
+}
+# requests sets the multipart boundary itself, so no Content-Type here
+MEMOS_AUTH_HEADERS = {"Authorization": f"Bearer {MEMOS_TOKEN}"}
+
+
+def create_session_with_retries() -> requests.Session:
+    """Create a pooled requests session with automatic retries."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+    )
+    # One keep-alive connection per worker thread, so none wait on the pool
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=ROOT_WORKERS + IMAGE_WORKERS,
+        max_retries=retry_strategy,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Keep-alive connections to Memos and the Bluesky CDN are shared by all
+# threads. Auth headers are passed per call so they never reach the CDN.
+SESSION = create_session_with_retries()
+
+# Logged in by main(); image workers use it to fetch original blobs
+BSKY_CLIENT = Client()
+
+# Shared pool for image downloads; uploads stay sequential per memo
+_image_pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS)
+
+
+
+class TokenBucket:
+    """Thread-safe token bucket that caps calls per second.
+
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Replaces the fixed 0.5s sleep between creations
+_memos_limiter = TokenBucket(MEMOS_RATE_LIMIT, burst=ROOT_WORKERS)
+_checkpoint_lock = threading.Lock()
+
+_attachments_db = sqlite3.connect(ATTACHMENTS_DB, check_same_thread=False)
+_attachments_db.execute(
+    "CREATE TABLE IF NOT EXISTS cid_map ("
+    "memo TEXT, cid TEXT, memos_name TEXT, PRIMARY KEY (memo, cid))"
+)
+_attachments_lock = threading.Lock()
+
+# Whether the server honours createTime on create. Unknown (None) until
+# the first memo is created; older builds ignore it and need a PATCH.
+_create_time_supported = None
+
+
 def get_bsky_posts(client):
     """Fetch ALL posts from Bluesky with robust pagination and proper image extraction."""
     posts = []
@@ -26,51 +153,80 @@ def get_bsky_posts(client):
     retry_count = 0
 
     user_did = client.me.did
-    print(f"📋 User DID: {user_did}\n")
+    logger.info(f"📋 User DID: {user_did}\n")
+
+    cdn_prefix = f"https://cdn.bsky.app/img/feed_fullsize/plain/{user_did}/"
+
+    # Retried cursors can return overlapping pages
+    seen_uris = set()
 
     try:
         while True:
             page_count += 1
-            print(
+            logger.info(
                 f"📥 Fetching page {page_count} (cursor: {cursor[:20] if cursor else 'None'}...)..."
             )
 
             try:
+                # Server-side filter drops replies to others; reposts
+                # still come back and are skipped below
                 feed = client.get_author_feed(
-                    actor=BSKY_HANDLE, limit=100, cursor=cursor
+                    actor=BSKY_HANDLE,
+                    filter="posts_and_author_threads",
+                    limit=100,
+                    cursor=cursor,
                 )
                 retry_count = 0
 
             except Exception as e:
                 retry_count += 1
-                print(f"⚠️  Error fetching page {page_count}: {e}")
+                logger.warning(f"⚠️  Error fetching page {page_count}: {e}")
 
                 if retry_count >= MAX_RETRIES:
-                    print(
+                    logger.error(
                         f"❌ Max retries ({MAX_RETRIES}) reached. Stopping pagination."
                     )
                     break
 
-                print(
-                    f"🔄 Retrying in 5 seconds... (attempt {retry_count}/{MAX_RETRIES})"
+                # Exponential backoff with jitter, unless the server says when
+                delay = min(30, 0.5 * 2**retry_count) + random.random() * 0.5
+                headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                retry_after = headers.get("Retry-After") or headers.get("retry-after")
+                try:
+                    delay = float(retry_after) if retry_after else delay
+                except ValueError:
+                    pass
+
+                logger.info(
+                    f"🔄 Retrying in {delay:.1f}s... (attempt {retry_count}/{MAX_RETRIES})"
                 )
-                time.sleep(5)
+                time.sleep(delay)
                 continue
 
             posts_in_page = 0
 
             for item in feed.feed:
                 try:
+                    # Reposts carry a reason; they are other people's posts
                     if getattr(item, "reason", None):
                         continue
 
+                    uri = item.post.uri
+                    if uri in seen_uris:
+                        continue
+                    seen_uris.add(uri)
+
                     parent_uri = None
                     record = item.post.record
 
-                    # Check if this is a self-reply
-                    if hasattr(record, "reply") and record.reply:
-                        parent_uri = record.reply.parent.uri
-                        parent_author_did = parent_uri.split("/")[2]
+                    # Check if this is a self-reply (the feed filter should
+                    # already exclude replies to other users)
+                    reply = getattr(record, "reply", None)
+                    if reply:
+                        parent_uri = reply.parent.uri
+                        # at://<did>/... -> <did>
+                        _, _, rest = parent_uri.partition("//")
+                        parent_author_did, _, _ = rest.partition("/")
 
                         if parent_author_did != user_did:
                             continue
@@ -78,191 +234,280 @@ def get_bsky_posts(client):
                     post_data = {
                         "content": record.text,
                         "created_at": record.created_at,
-                        "uri": item.post.uri,
+                        "uri": uri,
                         "parent_uri": parent_uri,
                         "images": [],
                         "is_self_reply": bool(parent_uri),
                     }
 
-                    # Extract images from embed with proper type checking
-                    if hasattr(record, "embed") and record.embed:
-                        embed = record.embed
-                        images = []
-
-                        # Check for direct image embed
-                        if isinstance(embed, models.AppBskyEmbedImages.Main):
-                            images = embed.images
-                        # Check for record with media
-                        elif isinstance(embed, models.AppBskyEmbedRecordWithMedia.Main):
-                            if hasattr(embed, "media") and isinstance(
-                                embed.media, models.AppBskyEmbedImages.Main
-                            ):
-                                images = embed.media.images
-
-                        for img in images:
-                            if hasattr(img, "image") and hasattr(img.image, "ref"):
-                                # FIX: Access the link attribute directly, don't convert to string
-                                cid_link = img.image.ref.link
-                                if cid_link:
-                                    image_url = f"https://cdn.bsky.app/img/feed_fullsize/plain/{user_did}/{cid_link}@jpeg"
-                                    post_data["images"].append(
-                                        {
-                                            "url": image_url,
-                                            "alt": getattr(img, "alt", ""),
-                                        }
-                                    )
-                                    print(
-                                        f"   📷 Found image: {image_url[-40:]}"
-                                    )  # Debug print
+                    # Extract images from direct image embeds or from the
+                    # media half of a record-with-media embed
+                    embed = getattr(record, "embed", None)
+                    embed_type = type(embed)
+                    if embed_type is _ImagesMain:
+                        images = embed.images
+                    elif (
+                        embed_type is _RecordWithMediaMain
+                        and type(getattr(embed, "media", None)) is _ImagesMain
+                    ):
+                        images = embed.media.images
+                    else:
+                        images = ()
+
+                    for img in images:
+                        image = getattr(img, "image", None)
+                        ref = getattr(image, "ref", None)
+                        if ref is not None:
+                            # FIX: Access the link attribute directly, don't convert to string
+                            cid_link = ref.link
+                            if cid_link:
+                                image_url = cdn_prefix + cid_link + "@jpeg"
+                                post_data["images"].append(
+                                    {
+                                        "url": image_url,
+                                        "cid": cid_link,
+                                        "did": user_did,
+                                        "mime": getattr(
+                                            image, "mime_type", "image/jpeg"
+                                        ),
+                                        "alt": getattr(img, "alt", ""),
+                                    }
+                                )
+                                logger.debug(f"   📷 Found image: {image_url[-40:]}")
 
                     posts.append(post_data)
                     posts_in_page += 1
 
                 except Exception as e:
-                    print(f"   ⚠️  Skipping post due to error: {e}")
+                    logger.warning(f"   ⚠️  Skipping post due to error: {e}")
                     continue
 
-            print(f"   ✓ Found {posts_in_page} posts on this page")
-            print(f"   📊 Total collected so far: {len(posts)} posts")
+            logger.info(f"   ✓ Found {posts_in_page} posts on this page")
+            logger.info(f"   📊 Total collected so far: {len(posts)} posts")
 
             cursor = feed.cursor
             if not cursor:
-                print(f"\n✅ Reached end of feed. No more pages to fetch.")
+                logger.info(f"\n✅ Reached end of feed. No more pages to fetch.")
                 break
 
-            print(f"   ⏳ Waiting {PAGINATION_DELAY}s before next page...\n")
-            time.sleep(PAGINATION_DELAY)
+            if PAGINATION_DELAY:
+                logger.info(f"   ⏳ Waiting {PAGINATION_DELAY}s before next page...\n")
+                time.sleep(PAGINATION_DELAY)
 
     except KeyboardInterrupt:
-        print(f"\n⚠️  Interrupted by user. Collected {len(posts)} posts so far.")
+        logger.warning(f"\n⚠️  Interrupted by user. Collected {len(posts)} posts so far.")
     except Exception as e:
-        print(f"\n❌ Unexpected error during pagination: {e}")
-        print(f"   Collected {len(posts)} posts before error.")
+        logger.error(f"\n❌ Unexpected error during pagination: {e}")
+        logger.info(f"   Collected {len(posts)} posts before error.")
 
-    print(
+    logger.info(
         f"\n✅ Successfully fetched {len(posts)} posts from Bluesky across {page_count} pages.\n"
     )
     return posts
 
 
-def upload_attachment_to_memo(image_url, memo_name):
-    """Download image from URL and upload to Memos as attachment linked to memo."""
-    temp_file = None
+def download_image(image_url):
+    """Download image from URL and return its bytes and content type."""
+    try:
+        # Stream into one buffer so large images are not held twice
+        with SESSION.get(image_url, timeout=30, stream=True) as img_response:
+            if img_response.status_code != 200:
+                logger.warning(
+                    f"  ⚠️  Failed to download image: HTTP {img_response.status_code}"
+                )
+                return None
+
+            content_type = img_response.headers.get("Content-Type", "image/jpeg")
+            buf = bytearray()
+            for chunk in img_response.iter_content(chunk_size=65536):
+                buf.extend(chunk)
+
+        logger.debug(f"  ✓ Downloaded {len(buf)} bytes")
+        return buf, content_type
+
+    except Exception as e:
+        logger.error(f"  ❌ Error downloading image: {e}")
+        return None
+
+
+def download_blob(img):
+    """Fetch the original image blob from the PDS, falling back to the CDN."""
+    try:
+        # getBlob returns the bytes as uploaded, without the CDN's JPEG re-encode
+        content = BSKY_CLIENT.com.atproto.sync.get_blob(
+            {"did": img["did"], "cid": img["cid"]}
+        )
+        logger.debug(f"  ✓ Fetched blob {img['cid'][-12:]} ({len(content)} bytes)")
+        return content, img["mime"]
+    except Exception as e:
+        logger.warning(f"  ⚠️  getBlob failed, using CDN copy: {e}")
+        return download_image(img["url"])
+
+
+def build_attachment_body(content, filename, mime_type, memo_name):
+    """Serialize the attachment JSON body without re-scanning the base64 data."""
+    meta = json.dumps({"filename": filename, "type": mime_type, "memo": memo_name})
+    # Base64 output never needs JSON escaping, so splice the raw bytes in
+    return (
+        meta[:-1].encode("utf-8")
+        + b', "content": "'
+        + base64.b64encode(content)
+        + b'"}'
+    )
+
+
+def upload_bytes_to_memo(content, filename, mime_type, memo_name):
+    """Upload image bytes to Memos as attachment linked to memo."""
+    upload_url = f"{MEMOS_URL}/api/v1/attachments"
     try:
-        print(f"  📎 Downloading image...")
-        img_response = requests.get(image_url, timeout=30)
+        logger.debug(f"  📤 Uploading to Memos...")
 
-        if img_response.status_code != 200:
-            print(
-                f"  ⚠️  Failed to download image: HTTP {img_response.status_code}"
+        if USE_MULTIPART:
+            files = {"file": (filename, content, mime_type)}
+            data = {"memo": memo_name, "filename": filename, "type": mime_type}
+            response = SESSION.post(
+                upload_url, files=files, data=data, headers=MEMOS_AUTH_HEADERS
             )
+        else:
+            body = build_attachment_body(content, filename, mime_type, memo_name)
+            response = SESSION.post(upload_url, data=body, headers=MEMOS_HEADERS)
+
+        if response.status_code == 200:
+            data = response.json()
+            logger.debug(f"  ✅ Attachment uploaded: {data.get('name')}")
+            return data.get("name")
+        else:
+            logger.error(f"  ❌ Upload failed: HTTP {response.status_code}")
+            logger.info(f"  Response: {response.text[:200]}")
             return None
 
-        content_type = img_response.headers.get("Content-Type", "image/jpeg")
-        ext = content_type.split("/")[-1] if "/" in content_type else "jpg"
-        temp_file = f"bluesky_import_{os.urandom(4).hex()}.{ext}"
+    except Exception as e:
+        logger.error(f"  ❌ Error processing image: {e}")
+        return None
+
+
+def lookup_attachment(memo_name, cid):
+    """Return the attachment already uploaded for this image, if any."""
+    with _attachments_lock:
+        row = _attachments_db.execute(
+            "SELECT memos_name FROM cid_map WHERE memo=? AND cid=?",
+            (memo_name, cid),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def record_attachment(memo_name, cid, attachment_name):
+    """Remember an uploaded image so it is not uploaded again."""
+    with _attachments_lock:
+        _attachments_db.execute(
+            "INSERT OR REPLACE INTO cid_map VALUES (?, ?, ?)",
+            (memo_name, cid, attachment_name),
+        )
+        _attachments_db.commit()
+
+
+def upload_images_to_memo(images, memo_name):
+    """Download images concurrently and upload each one as it arrives."""
+    pending = [img for img in images if not lookup_attachment(memo_name, img["cid"])]
+    if len(pending) < len(images):
+        logger.debug(
+            f"  ⏭️  {len(images) - len(pending)} image(s) already uploaded, skipping"
+        )
+
+    logger.debug(f"  📎 Downloading {len(pending)} image(s)...")
+    futures = {
+        _image_pool.submit(download_blob, img): img for img in pending
+    }
 
-        # Save temporarily
-        with open(temp_file, "wb") as f:
-            f.write(img_response.content)
+    for future in as_completed(futures):
+        result = future.result()
+        if not result:
+            continue
 
-        file_size = os.path.getsize(temp_file)
-        print(f"  ✓ Downloaded {file_size} bytes")
+        content, content_type = result
+        ext = content_type.split("/")[-1] if "/" in content_type else "jpg"
+        filename = f"bluesky_import_{os.urandom(4).hex()}.{ext}"
 
-        # Upload to Memos
-        mime_type, _ = mimetypes.guess_type(temp_file)
-        if not mime_type:
-            mime_type = content_type
+        mime_type = _EXT_MIME.get(ext.lower(), content_type)
 
-        with open(temp_file, "rb") as f:
-            encoded_content = base64.b64encode(f.read()).decode("utf-8")
+        attachment_name = upload_bytes_to_memo(
+            content, filename, mime_type, memo_name
+        )
+        if attachment_name:
+            record_attachment(memo_name, futures[future]["cid"], attachment_name)
 
-            payload = {
-                "filename": os.path.basename(temp_file),
-                "content": encoded_content,
-                "type": mime_type,
-                "memo": memo_name,
-            }
 
-            headers = {
-                "Authorization": f"Bearer {MEMOS_TOKEN}",
-                "Content-Type": "application/json",
-            }
+def same_timestamp(requested, returned):
+    """Check whether two ISO timestamps refer to the same second."""
+    try:
+        requested_dt = datetime.fromisoformat(requested.replace("Z", "+00:00"))
+        returned_dt = datetime.fromisoformat(returned.replace("Z", "+00:00"))
+        return int(requested_dt.timestamp()) == int(returned_dt.timestamp())
+    except Exception:
+        return False
 
-            upload_url = f"{MEMOS_URL}/api/v1/attachments"
-            print(f"  📤 Uploading to Memos...")
 
-            response = requests.post(upload_url, json=payload, headers=headers)
+def backdate_if_needed(name, created_at, returned_create_time):
+    """PATCH createTime only when the server ignored it on create."""
+    global _create_time_supported
 
-            if response.status_code == 200:
-                data = response.json()
-                print(f"  ✅ Attachment uploaded: {data.get('name')}")
-                return data.get("name")
-            else:
-                print(f"  ❌ Upload failed: HTTP {response.status_code}")
-                print(f"  Response: {response.text[:200]}")
-                return None
+    if _create_time_supported is None:
+        _create_time_supported = same_timestamp(created_at, returned_create_time)
+        if not _create_time_supported:
+            logger.info("ℹ️  Server ignores createTime on create, falling back to PATCH")
 
-    except Exception as e:
-        print(f"  ❌ Error processing image: {e}")
-        return None
+    if _create_time_supported:
+        return True
 
-    finally:
-        # Clean up temp file in all cases
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except:
-                pass
+    patch_url = f"{MEMOS_URL}/api/v1/{name}"
+    patch_payload = {"createTime": created_at}
+    patch_response = SESSION.patch(
+        patch_url, json=patch_payload, headers=MEMOS_HEADERS
+    )
+    return patch_response.status_code == 200
 
 
 def post_to_memos(post_data):
     """Post a root memo to Memos with optional images."""
     url = f"{MEMOS_URL}/api/v1/memos"
-    headers = {
-        "Authorization": f"Bearer {MEMOS_TOKEN}",
-        "Content-Type": "application/json",
-    }
 
     content = post_data["content"]
 
     payload = {
         "content": content,
         "visibility": "PRIVATE",
+        "createTime": post_data["created_at"],
     }
 
     try:
-        print(f"📤 Creating memo...")
-        response = requests.post(url, json=payload, headers=headers)
+        logger.debug(f"📤 Creating memo...")
+        response = SESSION.post(url, json=payload, headers=MEMOS_HEADERS)
 
         if response.status_code == 200:
             memo_data = response.json()
             memo_name = memo_data.get("name") or f"memos/{memo_data.get('id')}"
-            print(f"✅ Memo created: {memo_name}")
-
-            # Backdate the memo
-            patch_url = f"{MEMOS_URL}/api/v1/{memo_name}"
-            patch_payload = {"createTime": post_data["created_at"]}
-            patch_response = requests.patch(patch_url, json=patch_payload, headers=headers)
+            logger.info(f"✅ Memo created: {memo_name}")
 
-            if patch_response.status_code == 200:
-                print(f"✅ Timestamp updated")
+            # Backdate the memo (no-op when createTime was accepted)
+            if backdate_if_needed(
+                memo_name, post_data["created_at"], memo_data.get("createTime")
+            ):
+                logger.debug(f"✅ Timestamp updated")
             else:
-                print(f"⚠️  Timestamp update failed")
+                logger.warning(f"⚠️  Timestamp update failed")
 
             # Upload images
             if post_data["images"]:
-                print(f"  📎 Processing {len(post_data['images'])} image(s)...")
-                for img in post_data["images"]:
-                    upload_attachment_to_memo(img["url"], memo_name)
+                logger.debug(f"  📎 Processing {len(post_data['images'])} image(s)...")
+                upload_images_to_memo(post_data["images"], memo_name)
 
             return memo_name
         else:
-            print(f"❌ Failed ({response.status_code}): {response.text[:100]}")
+            logger.error(f"❌ Failed ({response.status_code}): {response.text[:100]}")
             return None
 
     except Exception as e:
-        print(f"❌ Error posting to Memos: {e}")
+        logger.error(f"❌ Error posting to Memos: {e}")
         return None
 
 
@@ -271,82 +516,122 @@ def post_reply_as_comment(post_data, parent_memo_name, parent_comment_name=None)
     memo_id = parent_memo_name.split("/")[-1]
     comment_url = f"{MEMOS_URL}/api/v1/memos/{memo_id}/comments"
 
-    headers = {
-        "Authorization": f"Bearer {MEMOS_TOKEN}",
-        "Content-Type": "application/json",
+    payload = {
+        "content": post_data["content"],
+        "createTime": post_data["created_at"],
     }
 
-    payload = {"content": post_data["content"]}
-
     # If this is a nested reply, specify parent comment
     if parent_comment_name:
         parent_id = parent_comment_name.split("/")[-1]
         payload["parentId"] = parent_id
 
     try:
-        print(f"  📤 Creating comment...")
-        response = requests.post(comment_url, json=payload, headers=headers)
+        logger.debug(f"  📤 Creating comment...")
+        response = SESSION.post(comment_url, json=payload, headers=MEMOS_HEADERS)
 
         if response.status_code == 200:
             comment_data = response.json()
             comment_name = comment_data.get("name")
-            print(f"  ✅ Comment created: {comment_name}")
-
-            # Backdate the comment
-            patch_url = f"{MEMOS_URL}/api/v1/{comment_name}"
-            patch_payload = {"createTime": post_data["created_at"]}
-            patch_response = requests.patch(patch_url, json=patch_payload, headers=headers)
-
-            if patch_response.status_code == 200:
-                print(f"  ✅ Comment timestamp updated")
+            logger.info(f"  ✅ Comment created: {comment_name}")
+
+            # Backdate the comment (no-op when createTime was accepted)
+            if backdate_if_needed(
+                comment_name,
+                post_data["created_at"],
+                comment_data.get("createTime"),
+            ):
+                logger.debug(f"  ✅ Comment timestamp updated")
             else:
-                print(f"  ⚠️  Comment timestamp update failed")
+                logger.warning(f"  ⚠️  Comment timestamp update failed")
 
             # Upload images for comment
             if post_data["images"]:
-                print(f"  📎 Processing {len(post_data['images'])} image(s) for comment...")
-                for img in post_data["images"]:
-                    upload_attachment_to_memo(img["url"], parent_memo_name)
+                logger.debug(f"  📎 Processing {len(post_data['images'])} image(s) for comment...")
+                upload_images_to_memo(post_data["images"], parent_memo_name)
 
             return comment_name
         else:
-            print(f"  ❌ Failed ({response.status_code}): {response.text[:100]}")
+            logger.error(f"  ❌ Failed ({response.status_code}): {response.text[:100]}")
             return None
 
     except Exception as e:
-        print(f"  ❌ Error posting comment: {e}")
+        logger.error(f"  ❌ Error posting comment: {e}")
         return None
 
 
+def load_checkpoint():
+    """Load the uri -> memo/comment maps saved by a previous run."""
+    state = {"memos": {}, "comments": {}}
+    if os.path.exists(CHECKPOINT_FILE):
+        try:
+            with open(CHECKPOINT_FILE, "r") as f:
+                state.update(json.load(f))
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read {CHECKPOINT_FILE}, starting fresh: {e}")
+    return state
+
+
+def record_checkpoint(state, kind, uri, name):
+    """Store a created memo/comment and atomically rewrite the checkpoint."""
+    with _checkpoint_lock:
+        state[kind][uri] = name
+        temp_file = CHECKPOINT_FILE + ".tmp"
+        with open(temp_file, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_file, CHECKPOINT_FILE)
+
+
+def import_root_post(index, total, post, state):
+    """Rate-limited post_to_memos call for the root-post worker pool."""
+    _memos_limiter.acquire()
+    logger.info(f"[{index}/{total}] Importing {post['uri']}")
+    memo_name = post_to_memos(post)
+    if memo_name:
+        record_checkpoint(state, "memos", post["uri"], memo_name)
+    return memo_name
+
+
+def import_reply(job, state):
+    """Rate-limited post_reply_as_comment call for a reply wave."""
+    post, parent_memo_name, parent_comment_name = job
+    _memos_limiter.acquire()
+    comment_name = post_reply_as_comment(
+        post, parent_memo_name, parent_comment_name
+    )
+    if comment_name:
+        record_checkpoint(state, "comments", post["uri"], comment_name)
+    return comment_name
+
+
 def main():
     """Main execution function."""
     if not all([MEMOS_URL, MEMOS_TOKEN, BSKY_HANDLE, BSKY_PASSWORD]):
-        print("❌ Missing configuration! Please set all environment variables.")
+        logger.error("❌ Missing configuration! Please set all environment variables.")
         return
 
     try:
-        print(f"🔵 Logging into Bluesky as {BSKY_HANDLE}...")
-        client = Client()
+        logger.info(f"🔵 Logging into Bluesky as {BSKY_HANDLE}...")
+        client = BSKY_CLIENT
         client.login(BSKY_HANDLE, BSKY_PASSWORD)
-        print(f"✅ Successfully logged in!\n")
+        logger.info(f"✅ Successfully logged in!\n")
     except Exception as e:
-        print(f"❌ Login failed: {e}")
+        logger.error(f"❌ Login failed: {e}")
         return
 
-    print("=" * 60)
-    print("STEP 1: FETCHING ALL POSTS FROM BLUESKY")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("STEP 1: FETCHING ALL POSTS FROM BLUESKY")
+    logger.info("=" * 60)
 
     posts = get_bsky_posts(client)
 
     if not posts:
-        print("No posts to import. Exiting.")
+        logger.info("No posts to import. Exiting.")
         return
 
     # Separate root posts and reply posts
     root_posts = []
     reply_posts = []
-    uri_to_post = {post["uri"]: post for post in posts}
 
     for post in posts:
         if post.get("is_self_reply"):
@@ -361,70 +646,113 @@ def main():
     regular = len(root_posts)
     replies = len(reply_posts)
 
-    print("=" * 60)
-    print("STEP 2: IMPORTING TO MEMOS")
-    print("=" * 60)
-    print(f"📊 Post breakdown:")
-    print(f"   • Root posts: {regular}")
-    print(f"   • Self-replies: {replies}")
-    print(f"   • TOTAL: {len(posts)} posts")
-    print(f"\n🚀 Starting import (oldest first)...\n")
-
-    uri_to_memo_map = {}
-    uri_to_comment_map = {}
-
-    # Import root posts first
-    for i, post in enumerate(root_posts, 1):
-        print(f"[{i}/{len(root_posts)}] ", end="")
-        memo_name = post_to_memos(post)
+    logger.info("=" * 60)
+    logger.info("STEP 2: IMPORTING TO MEMOS")
+    logger.info("=" * 60)
+    logger.info(f"📊 Post breakdown:")
+    logger.info(f"   • Root posts: {regular}")
+    logger.info(f"   • Self-replies: {replies}")
+    logger.info(f"   • TOTAL: {len(posts)} posts")
+    logger.info(f"\n🚀 Starting import (oldest first)...\n")
+
+    # Resume from a previous run: anything already mapped is skipped
+    state = load_checkpoint()
+    uri_to_memo_map = dict(state["memos"])
+    uri_to_comment_map = dict(state["comments"])
+    if uri_to_memo_map or uri_to_comment_map:
+        logger.info(
+            f"♻️  Resuming: {len(uri_to_memo_map)} memos and "
+            f"{len(uri_to_comment_map)} comments already imported\n"
+        )
+
+    pending_roots = [p for p in root_posts if p["uri"] not in uri_to_memo_map]
+
+    # Import root posts first. Each memo carries its own createTime, so
+    # server-side creation order does not affect the timeline; map()
+    # still returns results in the original (chronological) order.
+    total_roots = len(pending_roots)
+    with ThreadPoolExecutor(max_workers=ROOT_WORKERS) as executor:
+        results = list(
+            executor.map(
+                import_root_post,
+                range(1, total_roots + 1),
+                repeat(total_roots),
+                pending_roots,
+                repeat(state),
+            )
+        )
+
+    for post, memo_name in zip(pending_roots, results):
         if memo_name:
             uri_to_memo_map[post["uri"]] = memo_name
-        time.sleep(0.5)
 
-    # Import replies as comments
+    # Import replies as comments, one wave per thread depth. Siblings
+    # under the same parent are independent, so each wave runs in
+    # parallel; only reply-to-reply chains wait for the previous wave.
     if reply_posts:
-        print(f"\n📬 Processing {len(reply_posts)} replies as nested comments...\n")
-        for i, post in enumerate(reply_posts, 1):
-            print(f"[{i}/{len(reply_posts)}] ", end="")
-            parent_uri = post.get("parent_uri")
+        logger.info(f"\n📬 Processing {len(reply_posts)} replies as nested comments...\n")
 
+        children = defaultdict(list)
+        for post in reply_posts:
+            parent_uri = post.get("parent_uri")
             if not parent_uri:
-                print("⚠️  No parent found, skipping")
+                logger.warning("⚠️  No parent found, skipping")
                 continue
+            children[parent_uri].append(post)
+
+        frontier = list(uri_to_memo_map)
+        wave_count = 0
+
+        with ThreadPoolExecutor(max_workers=ROOT_WORKERS) as executor:
+            while frontier:
+                wave = []
+                resumed = []
+                for parent_uri in frontier:
+                    for post in children.pop(parent_uri, ()):
+                        if post["uri"] in uri_to_comment_map:
+                            # Created by a previous run; still walk its children
+                            resumed.append(post["uri"])
+                            continue
 
-            # Check if parent is a root post or another reply
-            parent_memo_name = uri_to_memo_map.get(parent_uri)
-            parent_comment_name = uri_to_comment_map.get(parent_uri)
-
-            if parent_memo_name:
-                # Reply to root post
-                comment_name = post_reply_as_comment(post, parent_memo_name)
-                if comment_name:
-                    uri_to_comment_map[post["uri"]] = comment_name
-            elif parent_comment_name:
-                # Reply to another comment (nested)
-                # Extract memo_id from parent_comment_name (format: memos/123/comments/456)
-                memo_id = parent_comment_name.split("/")[1]
-                memo_name = f"memos/{memo_id}"
-                comment_name = post_reply_as_comment(
-                    post, memo_name, parent_comment_name
-                )
-                if comment_name:
-                    uri_to_comment_map[post["uri"]] = comment_name
-            else:
-                print(
-                    f"⚠️  Parent not found (might be a reply to an excluded post), skipping"
-                )
-                continue
+                        parent_memo_name = uri_to_memo_map.get(parent_uri)
+                        if parent_memo_name:
+                            # Reply to root post
+                            wave.append((post, parent_memo_name, None))
+                        else:
+                            # Reply to another comment (nested)
+                            # Extract memo_id from parent_comment_name (format: memos/123/comments/456)
+                            parent_comment_name = uri_to_comment_map[parent_uri]
+                            memo_id = parent_comment_name.split("/")[1]
+                            wave.append(
+                                (post, f"memos/{memo_id}", parent_comment_name)
+                            )
+
+                frontier = resumed
+                if not wave:
+                    continue
+
+                wave_count += 1
+                logger.info(f"🌊 Wave {wave_count}: {len(wave)} replies")
+                results = list(executor.map(import_reply, wave, repeat(state)))
 
-            time.sleep(0.5)
+                for (post, _, _), comment_name in zip(wave, results):
+                    if comment_name:
+                        uri_to_comment_map[post["uri"]] = comment_name
+                        frontier.append(post["uri"])
+
+        orphaned = sum(len(posts) for posts in children.values())
+        if orphaned:
+            logger.warning(
+                f"⚠️  Skipped {orphaned} replies whose parent was not found "
+                f"(might be replies to excluded posts)"
+            )
 
-    print("\n" + "=" * 60)
-    print("🎉 IMPORT COMPLETE!")
-    print("=" * 60)
-    print(f"✅ Successfully imported {len(root_posts)} root posts")
+    logger.info("\n" + "=" * 60)
+    logger.info("🎉 IMPORT COMPLETE!")
+    logger.info("=" * 60)
+    logger.info(f"✅ Successfully imported {len(root_posts)} root posts")
     if reply_posts:
-        print(f"✅ Created {len(reply_posts)} nested comments for self-replies")
+        logger.info(f"✅ Created {len(reply_posts)} nested comments for self-replies")
 
 
 if __name__ == "__main__":
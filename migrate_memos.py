@@ -5,7 +5,16 @@ import base64
 import requests
 import json
 import logging
-from typing import Optional, List, Dict, Any
+import tempfile
+import threading
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Callable
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+    FIRST_COMPLETED,
+)
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -19,12 +28,28 @@ DEST_MEMOS_URL = os.getenv("MIGRATION_DEST_HOST")
 DEST_MEMOS_TOKEN = os.getenv("MIGRATION_DEST_TOKEN")
 SOURCE_HANDLE = os.getenv("MIGRATION_ADD_PREFIX_HANDLE", "")
 PAGE_SIZE = int(os.getenv("PAGE_SIZE", "100"))
+# Average spacing between API calls; enforced by a token bucket, so
+# calls that already took longer than this are not delayed further
 RATE_LIMIT_DELAY = float(os.getenv("RATE_LIMIT_DELAY", "0.1"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+# Memos migrated concurrently
+MIGRATION_WORKERS = int(os.getenv("MIGRATION_WORKERS", "8"))
+# Attachment downloads/uploads in flight across all memos
+ATTACHMENT_WORKERS = int(os.getenv("MIGRATION_ATTACHMENT_WORKERS", "8"))
 # Optional: Filter memos by handle (e.g. "myhandle"). 
 # If set, only memos starting with "@{MIGRATION_FILTER_HANDLE}:" will be copied, 
 # and the prefix will be removed.
 FILTER_HANDLE = os.getenv("MIGRATION_FILTER_HANDLE")
+# Send attachments as raw multipart/form-data instead of base64 JSON.
+# Only enable this if your Memos server accepts multipart uploads.
+USE_MULTIPART = os.getenv("MEMOS_MULTIPART_UPLOAD", "false").lower() == "true"
+# Attachments larger than this spill from memory to a temp file
+SPOOL_MAX_SIZE = 4 * 1024 * 1024
+# Multiple of 3 so per-chunk base64 output concatenates cleanly
+B64_CHUNK_SIZE = 3 * 64 * 1024
+# Names of source memos already copied, one per line, so an interrupted
+# migration can be re-run without duplicating them
+MIGRATED_FILE = ".migrated"
 # Fixed: DRY_RUN logic was inverted
 DRY_RUN = False
 # ---------------------
@@ -37,6 +62,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Separate from the memo pool so memo workers can wait on it without
+# deadlocking; its size caps attachment traffic to both servers.
+_attachment_pool = ThreadPoolExecutor(max_workers=ATTACHMENT_WORKERS)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that caps calls per second.
+
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# Whether the destination honours createTime on create. Unknown (None)
+# until the first memo is created; older builds ignore it and need a PATCH.
+_create_time_supported = None
+
+# Shared by every API call, across all worker threads
+_rate_limiter = TokenBucket(
+    1 / RATE_LIMIT_DELAY if RATE_LIMIT_DELAY > 0 else 0,
+    burst=MIGRATION_WORKERS,
+)
+
+
+@dataclass(frozen=True)
+class ApiClient:
+    """Session, base URL and auth headers for one Memos instance."""
+
+    base_url: str
+    headers: Dict[str, str]
+    json_headers: Dict[str, str]
+    session: requests.Session
+    memos_endpoint: str
+    attachments_endpoint: str
+
+    @classmethod
+    def create(
+        cls, url: str, token: str, session: requests.Session
+    ) -> "ApiClient":
+        """Build the client once so helpers don't rebuild URLs and headers."""
+        base_url = url.rstrip("/")
+        headers = {"Authorization": f"Bearer {token}"}
+        return cls(
+            base_url=base_url,
+            headers=headers,
+            json_headers={**headers, "Content-Type": "application/json"},
+            session=session,
+            memos_endpoint=f"{base_url}/api/v1/memos",
+            attachments_endpoint=f"{base_url}/api/v1/attachments",
+        )
+
 
 def create_session_with_retries() -> requests.Session:
     """Create a requests session with automatic retries."""
@@ -47,83 +146,80 @@ def create_session_with_retries() -> requests.Session:
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST", "PATCH"],
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+    # Enough keep-alive connections for every memo and attachment worker
+    pool_size = MIGRATION_WORKERS + ATTACHMENT_WORKERS
+    for prefix in ("http://", "https://", SOURCE_MEMOS_URL, DEST_MEMOS_URL):
+        if not prefix:
+            continue
+        # Separate pools per host so bursts on one side don't starve the other
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry_strategy,
+        )
+        session.mount(prefix, adapter)
     return session
 
 
-def fetch_all_memos(
-    source_url: str, source_token: str, session: requests.Session
-) -> List[Dict[str, Any]]:
-    """Fetch all memos from source instance with pagination."""
-    logger.info("🔍 Fetching all memos from source instance...")
-    all_memos = []
-    page_token = None
-    page_count = 0
-    max_pages = 1000
-
-    headers = {"Authorization": f"Bearer {source_token}"}
+def fetch_memo_page(
+    source: ApiClient, page_token: Optional[str]
+) -> Dict[str, Any]:
+    """Fetch a single page of memos."""
+    # Fixed: Use params dict for proper URL encoding of pageToken
+    params = {"pageSize": PAGE_SIZE}
+    if page_token:
+        params["pageToken"] = page_token
+
+    _rate_limiter.acquire()
+    response = source.session.get(
+        source.memos_endpoint,
+        params=params,
+        headers=source.headers,
+        timeout=30,
+    )
+    response.raise_for_status()
+    return json.loads(response.content)
 
-    try:
-        while page_count < max_pages:
-            page_count += 1
 
-            # Fixed: Use params dict for proper URL encoding of pageToken
-            params = {"pageSize": PAGE_SIZE}
-            if page_token:
-                params["pageToken"] = page_token
+def iter_memo_pages(source: ApiClient) -> Iterator[List[Dict[str, Any]]]:
+    """Yield pages of memos, requesting the next page before yielding.
 
-            response = session.get(
-                f"{source_url.rstrip('/')}/api/v1/memos",
-                params=params,
-                headers=headers,
-                timeout=30,
-            )
-            response.raise_for_status()
+    Page tokens are opaque, so pages cannot be fetched in parallel; instead
+    page k+1 is in flight while the caller processes page k.
+    """
+    max_pages = 1000
 
-            data = response.json()
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        future = prefetcher.submit(fetch_memo_page, source, None)
+        for _ in range(max_pages):
+            data = future.result()
             memos = data.get("memos", [])
-
             if not memos:
-                break
-
-            all_memos.extend(memos)
-            logger.info(
-                f"  📄 Page {page_count}: {len(memos)} memos "
-                f"(total: {len(all_memos)})"
-            )
+                return
 
             page_token = data.get("nextPageToken")
-            if not page_token:
-                break
-
-            time.sleep(RATE_LIMIT_DELAY)
+            if page_token:
+                future = prefetcher.submit(fetch_memo_page, source, page_token)
 
-        logger.info(f"✅ Found {len(all_memos)} total memos\n")
-        return all_memos
+            yield memos
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ Error fetching memos: {e}")
-        return []
+            if not page_token:
+                return
 
 
 def fetch_memo_attachments(
-    memo_name: str,
-    source_url: str,
-    source_token: str,
-    session: requests.Session,
+    memo_name: str, source: ApiClient
 ) -> List[Dict[str, Any]]:
     """Fetch all attachments for a specific memo."""
     try:
-        headers = {"Authorization": f"Bearer {source_token}"}
         memo_id = memo_name.split("/")[-1]
-        url = f"{source_url.rstrip('/')}/api/v1/memos/{memo_id}/attachments"
+        url = f"{source.memos_endpoint}/{memo_id}/attachments"
 
-        response = session.get(url, headers=headers, timeout=30)
+        _rate_limiter.acquire()
+        response = source.session.get(url, headers=source.headers, timeout=30)
         response.raise_for_status()
 
-        data = response.json()
+        data = json.loads(response.content)
         attachments = data.get("attachments", [])
         if attachments:
             logger.info(f"    📎 Found {len(attachments)} attachments")
@@ -135,12 +231,9 @@ def fetch_memo_attachments(
 
 
 def download_attachment(
-    attachment: Dict[str, Any],
-    source_url: str,
-    source_token: str,
-    session: requests.Session,
+    attachment: Dict[str, Any], source: ApiClient
 ) -> Optional[Dict[str, Any]]:
-    """Download attachment from source instance."""
+    """Download attachment from source instance into a spooled temp file."""
     try:
         attachment_name = attachment.get("name")
         if not attachment_name:
@@ -154,71 +247,86 @@ def download_attachment(
             else attachment_name
         )
         filename = attachment.get("filename", attachment_id)
-
-        headers = {"Authorization": f"Bearer {source_token}"}
-
-        # Try API endpoint first
-        api_url = f"{source_url.rstrip('/')}/api/v1/attachments/{attachment_id}"
-        response = session.get(api_url, headers=headers, timeout=60)
-
-        # Check if response is JSON with base64 content
-        if (
-            response.status_code == 200
-            and "application/json" in response.headers.get("Content-Type", "")
-        ):
-            try:
-                json_data = response.json()
-                content_field = json_data.get("content", "")
-                if content_field:
-                    file_content = base64.b64decode(content_field)
-                    logger.info(
-                        f"    📥 Downloaded (API): {filename} "
-                        f"({len(file_content) / 1024:.2f} KB)"
-                    )
-                    return {
-                        "filename": filename,
-                        "content": file_content,
-                        "type": attachment.get(
-                            "type", "application/octet-stream"
-                        ),
-                    }
-            except (json.JSONDecodeError, base64.binascii.Error) as e:
-                logger.debug(f"    Failed to parse JSON response: {e}")
-
-        # Fallback to file serving endpoint
-        file_url = (
-            f"{source_url.rstrip('/')}/file/{attachment_name}/{filename}"
-        )
-        response = session.get(file_url, headers=headers, timeout=60)
+        attachment_type = attachment.get("type", "application/octet-stream")
+
+        file_obj = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+        # Try the file serving endpoint first: raw bytes, no base64
+        file_url = f"{source.base_url}/file/{attachment_name}/{filename}"
+        _rate_limiter.acquire()
+        with source.session.get(
+            file_url, headers=source.headers, timeout=60, stream=True
+        ) as response:
+            if response.status_code == 200:
+                for chunk in response.iter_content(chunk_size=65536):
+                    file_obj.write(chunk)
+                size = file_obj.tell()
+                logger.info(
+                    f"    📥 Downloaded (file): {filename} "
+                    f"({size / 1024:.2f} KB)"
+                )
+                return {
+                    "filename": filename,
+                    "file": file_obj,
+                    "size": size,
+                    "type": attachment_type,
+                }
+
+        # Fallback to API endpoint returning JSON with base64 content
+        api_url = f"{source.attachments_endpoint}/{attachment_id}"
+        _rate_limiter.acquire()
+        response = source.session.get(api_url, headers=source.headers, timeout=60)
         response.raise_for_status()
 
-        content = response.content
-        logger.info(
-            f"    📥 Downloaded (file): {filename} "
-            f"({len(content) / 1024:.2f} KB)"
-        )
-        return {
-            "filename": filename,
-            "content": content,
-            "type": attachment.get("type", "application/octet-stream"),
-        }
+        try:
+            content_field = json.loads(response.content).get("content", "")
+            if content_field:
+                file_obj.write(base64.b64decode(content_field))
+                size = file_obj.tell()
+                logger.info(
+                    f"    📥 Downloaded (API): {filename} "
+                    f"({size / 1024:.2f} KB)"
+                )
+                return {
+                    "filename": filename,
+                    "file": file_obj,
+                    "size": size,
+                    "type": attachment_type,
+                }
+        except (json.JSONDecodeError, base64.binascii.Error) as e:
+            logger.debug(f"    Failed to parse JSON response: {e}")
+
+        file_obj.close()
+        logger.warning(f"    ⚠️ No content returned for {filename}")
+        return None
 
     except requests.exceptions.RequestException as e:
         logger.warning(f"    ⚠️ Failed to download attachment: {e}")
         return None
 
 
+def encode_file_base64(file_obj) -> bytes:
+    """Base64-encode a file in chunks instead of one full-size read."""
+    file_obj.seek(0)
+    parts = []
+    while True:
+        chunk = file_obj.read(B64_CHUNK_SIZE)
+        if not chunk:
+            break
+        parts.append(base64.b64encode(chunk))
+    return b"".join(parts)
+
+
 def create_memo_in_dest(
-    memo: Dict[str, Any],
-    dest_url: str,
-    dest_token: str,
-    session: requests.Session,
-    source_handle: str = "",
-) -> Optional[str]:
-    """Create memo in destination instance."""
+    memo: Dict[str, Any], dest: ApiClient, source_handle: str = ""
+) -> Optional[Tuple[str, Optional[str]]]:
+    """Create memo in destination instance.
+
+    Returns the new memo name and the createTime the server reported.
+    """
     if DRY_RUN:
         logger.info("  [DRY RUN] Would create memo")
-        return "dry-run-memo-name"
+        return "dry-run-memo-name", None
 
     try:
         content = memo.get("content", "")
@@ -229,25 +337,23 @@ def create_memo_in_dest(
             "content": content,
             "visibility": memo.get("visibility", "PRIVATE"),
         }
+        if memo.get("createTime"):
+            payload["createTime"] = memo["createTime"]
 
-        headers = {
-            "Authorization": f"Bearer {dest_token}",
-            "Content-Type": "application/json",
-        }
-
-        response = session.post(
-            f"{dest_url.rstrip('/')}/api/v1/memos",
+        _rate_limiter.acquire()
+        response = dest.session.post(
+            dest.memos_endpoint,
             json=payload,
-            headers=headers,
+            headers=dest.json_headers,
             timeout=30,
         )
         response.raise_for_status()
 
-        data = response.json()
+        data = json.loads(response.content)
         new_memo_name = data.get("name")
         logger.info(f"  ✅ Memo created: {new_memo_name}")
 
-        return new_memo_name
+        return new_memo_name, data.get("createTime")
 
     except requests.exceptions.RequestException as e:
         logger.error(f"  ❌ Failed to create memo: {e}")
@@ -256,12 +362,35 @@ def create_memo_in_dest(
         return None
 
 
+def same_timestamp(requested: str, returned: Optional[str]) -> bool:
+    """Check whether two ISO timestamps refer to the same second."""
+    try:
+        requested_dt = datetime.fromisoformat(requested.replace("Z", "+00:00"))
+        returned_dt = datetime.fromisoformat(returned.replace("Z", "+00:00"))
+        return int(requested_dt.timestamp()) == int(returned_dt.timestamp())
+    except Exception:
+        return False
+
+
+def needs_timestamp_patch(
+    source_timestamp: Optional[str], dest_timestamp: Optional[str]
+) -> bool:
+    """Decide whether createTime still has to be PATCHed after creation."""
+    global _create_time_supported
+
+    if _create_time_supported is None and source_timestamp and not DRY_RUN:
+        _create_time_supported = same_timestamp(source_timestamp, dest_timestamp)
+        if not _create_time_supported:
+            logger.info(
+                "ℹ️  Destination ignores createTime on create, "
+                "falling back to PATCH"
+            )
+
+    return not _create_time_supported
+
+
 def update_memo_timestamp(
-    dest_memo_name: str,
-    source_timestamp: str,
-    dest_url: str,
-    dest_token: str,
-    session: requests.Session,
+    dest_memo_name: str, source_timestamp: str, dest: ApiClient
 ) -> bool:
     """Update the timestamp of the newly created memo."""
     if DRY_RUN:
@@ -272,16 +401,12 @@ def update_memo_timestamp(
         return False
 
     try:
-        headers = {
-            "Authorization": f"Bearer {dest_token}",
-            "Content-Type": "application/json",
-        }
-
         patch_payload = {"createTime": source_timestamp}
-        patch_response = session.patch(
-            f"{dest_url.rstrip('/')}/api/v1/{dest_memo_name}",
+        _rate_limiter.acquire()
+        patch_response = dest.session.patch(
+            f"{dest.base_url}/api/v1/{dest_memo_name}",
             json=patch_payload,
-            headers=headers,
+            headers=dest.json_headers,
             timeout=30,
         )
 
@@ -301,11 +426,7 @@ def update_memo_timestamp(
 
 
 def upload_attachment_to_dest(
-    attachment_data: Dict[str, Any],
-    dest_memo_name: str,
-    dest_url: str,
-    dest_token: str,
-    session: requests.Session,
+    attachment_data: Dict[str, Any], dest_memo_name: str, dest: ApiClient
 ) -> Optional[str]:
     """Upload attachment to destination memo."""
     if DRY_RUN:
@@ -318,23 +439,40 @@ def upload_attachment_to_dest(
         if not attachment_data:
             return None
 
-        encoded = base64.b64encode(attachment_data["content"]).decode("utf-8")
-
-        payload = {
+        metadata = {
             "filename": attachment_data["filename"],
-            "content": encoded,
             "type": attachment_data["type"],
             "memo": dest_memo_name,
         }
-
-        headers = {"Authorization": f"Bearer {dest_token}"}
-
-        response = session.post(
-            f"{dest_url.rstrip('/')}/api/v1/attachments",
-            json=payload,
-            headers=headers,
-            timeout=120,
-        )
+        file_obj = attachment_data["file"]
+        _rate_limiter.acquire()
+
+        if USE_MULTIPART:
+            file_obj.seek(0)
+            files = {
+                "file": (metadata["filename"], file_obj, metadata["type"])
+            }
+            response = dest.session.post(
+                dest.attachments_endpoint,
+                files=files,
+                data=metadata,
+                headers=dest.headers,
+                timeout=120,
+            )
+        else:
+            # Base64 never needs JSON escaping, so splice it in as bytes
+            body = (
+                json.dumps(metadata)[:-1].encode("utf-8")
+                + b', "content": "'
+                + encode_file_base64(file_obj)
+                + b'"}'
+            )
+            response = dest.session.post(
+                dest.attachments_endpoint,
+                data=body,
+                headers=dest.json_headers,
+                timeout=120,
+            )
         response.raise_for_status()
 
         attachment_name = response.json().get("name")
@@ -350,14 +488,16 @@ def upload_attachment_to_dest(
 
 def migrate_memo(
     memo: Dict[str, Any],
-    source_url: str,
-    source_token: str,
-    dest_url: str,
-    dest_token: str,
-    session: requests.Session,
+    source: ApiClient,
+    dest: ApiClient,
     source_handle: str = "",
+    on_created: Optional[Callable[[str], None]] = None,
 ) -> bool:
-    """Migrate a single memo with all its attachments."""
+    """Migrate a single memo with all its attachments.
+
+    on_created is called with the source memo name as soon as the
+    destination memo exists, whether or not its attachments upload.
+    """
     memo_name = memo.get("name")
     if not memo_name:
         logger.warning("Memo has no name, skipping")
@@ -388,45 +528,55 @@ def migrate_memo(
             return False
     # -----------------------
 
-    # Get attachments from source
-    attachments = fetch_memo_attachments(
-        memo_name, source_url, source_token, session
-    )
-
-    # Download attachments
-    attachment_files = []
-    for attachment in attachments:
-        attachment_data = download_attachment(
-            attachment, source_url, source_token, session
-        )
-        if attachment_data:
-            attachment_files.append(attachment_data)
-        time.sleep(RATE_LIMIT_DELAY)
-
-    # Create memo in destination
-    dest_memo_name = create_memo_in_dest(
-        memo, dest_url, dest_token, session, source_handle
-    )
-    if not dest_memo_name:
-        return False
+    # Get attachments from source. The memo listing usually embeds them
+    # already; only ask the attachments endpoint when it doesn't.
+    listed = memo.get("attachments", memo.get("resources"))
+    if listed is not None:
+        attachments = listed
+        if attachments:
+            logger.info(f"    📎 Found {len(attachments)} attachments")
+    else:
+        attachments = fetch_memo_attachments(memo_name, source)
 
-    # Update timestamp
-    source_timestamp = memo.get("createTime")
-    update_memo_timestamp(
-        dest_memo_name, source_timestamp, dest_url, dest_token, session
+    # Download attachments in parallel
+    downloads = _attachment_pool.map(
+        lambda attachment: download_attachment(attachment, source),
+        attachments,
     )
+    attachment_files = [data for data in downloads if data]
+    upload_futures = []
 
-    # Upload attachments
-    success = True
-    for attachment_data in attachment_files:
-        result = upload_attachment_to_dest(
-            attachment_data, dest_memo_name, dest_url, dest_token, session
-        )
-        if not result:
-            success = False
-        time.sleep(RATE_LIMIT_DELAY)
-
-    return success
+    try:
+        # Create memo in destination
+        created = create_memo_in_dest(memo, dest, source_handle)
+        if not created:
+            return False
+        dest_memo_name, dest_timestamp = created
+        if on_created:
+            on_created(memo_name)
+
+        # Update timestamp, unless it was already accepted on create
+        source_timestamp = memo.get("createTime")
+        if needs_timestamp_patch(source_timestamp, dest_timestamp):
+            update_memo_timestamp(dest_memo_name, source_timestamp, dest)
+
+        # Upload attachments in parallel. Collect every result before
+        # all(), which would stop at the first failure.
+        upload_futures = [
+            _attachment_pool.submit(
+                upload_attachment_to_dest, attachment_data, dest_memo_name, dest
+            )
+            for attachment_data in attachment_files
+        ]
+        results = [future.result() for future in upload_futures]
+        return all(results)
+    finally:
+        # Uploads still read the spooled files; a failing sibling must
+        # not close them underneath, so let every upload finish first
+        wait(upload_futures)
+        # Release spooled attachment files (memory or temp files)
+        for attachment_data in attachment_files:
+            attachment_data["file"].close()
 
 
 def validate_config() -> bool:
@@ -468,65 +618,124 @@ def main():
 
     # Create session with retries
     session = create_session_with_retries()
-
-    try:
-        # Fetch all memos from source
-        all_memos = fetch_all_memos(SOURCE_MEMOS_URL, SOURCE_MEMOS_TOKEN, session)
-
-        if not all_memos:
-            logger.error("❌ No memos to migrate")
+    source = ApiClient.create(SOURCE_MEMOS_URL, SOURCE_MEMOS_TOKEN, session)
+    dest = ApiClient.create(DEST_MEMOS_URL, DEST_MEMOS_TOKEN, session)
+
+    # Resume: skip memos recorded by a previous run
+    migrated = set()
+    if os.path.exists(MIGRATED_FILE):
+        with open(MIGRATED_FILE, "r", encoding="utf-8") as f:
+            migrated = set(f.read().splitlines())
+        logger.info(f"♻️  Resuming: {len(migrated)} memos already migrated\n")
+
+    # Append-only log, written from worker threads under a lock
+    migrated_log = open(MIGRATED_FILE, "a", encoding="utf-8", buffering=1)
+    record_lock = threading.Lock()
+
+    def record_created(memo_name: str) -> None:
+        # Logged once the destination memo exists, so a re-run never
+        # creates it again even if an attachment failed
+        if DRY_RUN:
             return
+        with record_lock:
+            migrated_log.write(f"{memo_name}\n")
 
-        # Migrate each memo
-        success_count = 0
-        fail_count = 0
+    try:
+        # Migrate memos concurrently while later pages are still being
+        # fetched. Each memo carries its own createTime, so completion
+        # order does not affect the timeline.
+        stats = {"success": 0, "fail": 0, "done": 0, "seen": 0, "skipped": 0}
         start_time = time.time()
+        logger.info("🔍 Fetching memos from source instance...")
 
-        for idx, memo in enumerate(all_memos, 1):
-            logger.info(f"\n{'='*60}")
-            logger.info(f"📊 Progress: {idx}/{len(all_memos)}")
-            logger.info(f"{'='*60}")
-
+        def record_result(future) -> None:
+            # Runs as a done callback, so every finished future is counted,
+            # including those completing while the pool shuts down
+            if future.cancelled():
+                return
             try:
-                if migrate_memo(
-                    memo,
-                    SOURCE_MEMOS_URL,
-                    SOURCE_MEMOS_TOKEN,
-                    DEST_MEMOS_URL,
-                    DEST_MEMOS_TOKEN,
-                    session,
-                    SOURCE_HANDLE,
-                ):
-                    success_count += 1
-                else:
-                    fail_count += 1
+                ok = future.result()
             except Exception as e:
                 logger.error(f"❌ Failed to migrate memo: {e}", exc_info=True)
-                fail_count += 1
+                ok = False
+
+            with record_lock:
+                stats["success" if ok else "fail"] += 1
+                stats["done"] += 1
+                idx = stats["done"]
+                seen = stats["seen"]
+            logger.info(f"📊 Progress: {idx}/{seen}")
 
-            # Show progress stats every 10 memos
-            if idx % 10 == 0 or idx == len(all_memos):
+            # Show progress stats every 10 memos (ETA covers pages seen so far)
+            if idx % 10 == 0:
                 elapsed = time.time() - start_time
                 rate = (idx / elapsed * 60) if elapsed > 0 else 0
-                remaining = len(all_memos) - idx
+                remaining = seen - idx
                 eta = (remaining / (rate / 60)) if rate > 0 else 0
 
                 logger.info(
                     f"\n📈 Rate: {rate:.1f} memos/min, ETA: {eta/60:.1f} min"
                 )
 
+        # Bound queued work so memory stays O(page) rather than O(corpus)
+        max_pending = MIGRATION_WORKERS + PAGE_SIZE
+
+        with ThreadPoolExecutor(max_workers=MIGRATION_WORKERS) as executor:
+            pending = set()
+            try:
+                for page_count, memos in enumerate(iter_memo_pages(source), 1):
+                    logger.info(f"  📄 Page {page_count}: {len(memos)} memos")
+
+                    for memo in memos:
+                        if memo.get("name") in migrated:
+                            stats["skipped"] += 1
+                            continue
+
+                        with record_lock:
+                            stats["seen"] += 1
+                        future = executor.submit(
+                            migrate_memo, memo, source, dest, SOURCE_HANDLE,
+                            record_created,
+                        )
+                        future.add_done_callback(record_result)
+                        pending.add(future)
+
+                    while len(pending) > max_pending:
+                        _, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            except requests.exceptions.RequestException as e:
+                logger.error(f"❌ Error fetching memos: {e}")
+            except BaseException:
+                # Ctrl+C or an unexpected error: drop queued migrations
+                # instead of letting the pool run them all on exit
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        # Leaving the pool joins its workers, and done callbacks run on
+        # them, so every result is recorded before the summary below
+
+        if not stats["seen"]:
+            if stats["skipped"]:
+                logger.info("✅ All memos were already migrated")
+            else:
+                logger.error("❌ No memos to migrate")
+            return
+
         # Summary
         elapsed = time.time() - start_time
         logger.info(f"\n{'='*60}")
         logger.info("🎉 MIGRATION COMPLETE!")
         logger.info(f"{'='*60}")
-        logger.info(f"✅ Successfully migrated: {success_count}")
-        logger.info(f"❌ Failed: {fail_count}")
-        logger.info(f"📊 Total processed: {len(all_memos)}")
+        logger.info(f"✅ Successfully migrated: {stats['success']}")
+        logger.info(f"❌ Failed: {stats['fail']}")
+        logger.info(f"📊 Total processed: {stats['done']}")
+        if stats["skipped"]:
+            logger.info(f"⏭️  Already migrated (skipped): {stats['skipped']}")
         logger.info(f"⏱️  Total time: {elapsed/60:.1f} minutes")
         logger.info(f"{'='*60}\n")
 
     finally:
+        migrated_log.close()
         session.close()
 
 
@@ -1,11 +1,19 @@
 import os
+import sys
 import time
+import random
 import hashlib
 import base64
 import requests
 import json
-import subprocess
+import queue
+import threading
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from playwright.sync_api import sync_playwright
+from yt_dlp import YoutubeDL
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 
@@ -26,13 +34,88 @@ START_DAY = int(os.getenv("X_START_DAY", "1"))
 CHUNK_DAYS = 30  # Search chunk size in days
 
 FILTER_REPLIES = os.getenv("X_FILTER_REPLIES", "true").lower() == "true"
+# Send attachments as raw multipart/form-data instead of base64 JSON.
+# Only enable this if your Memos server accepts multipart uploads.
+USE_MULTIPART = os.getenv("MEMOS_MULTIPART_UPLOAD", "false").lower() == "true"
+# Local cache of existing-memo signatures, shared with the other X scrapers
+DEDUP_DB = "memos_dedup.db"
 # ---------------------
 
 
+class JitteredRetry(Retry):
+    """Retry whose backoff is randomized so clients don't retry in lockstep."""
+
+    def get_backoff_time(self) -> float:
+        return super().get_backoff_time() * random.uniform(0.5, 1.5)
+
+
+def create_session_with_retries() -> requests.Session:
+    """Create a pooled requests session with automatic retries."""
+    session = requests.Session()
+    # Default allowed methods: POSTs are never replayed, so no double memos
+    retry_strategy = JitteredRetry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=32,
+        pool_maxsize=32,
+        pool_block=False,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Keep-alive connections shared by every Memos and image request
+SESSION = create_session_with_retries()
+
+# Attachment uploads for a memo run side by side
+UPLOAD_WORKERS = 4
+_upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+
+_dedup_db = sqlite3.connect(DEDUP_DB)
+_dedup_db.execute(
+    "CREATE TABLE IF NOT EXISTS memo_sig ("
+    "host TEXT, name TEXT, sig BLOB, updated REAL, PRIMARY KEY (host, name))"
+)
+
+
+def text_signature(text):
+    """64-bit integer signature used for duplicate detection."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
 def fetch_existing_memos():
-    """Fetch all existing memos to check for duplicates."""
-    print("🔍 Fetching existing memos to prevent duplicates...")
-    existing = set()
+    """Fetch all existing memos to check for duplicates.
+
+    Signatures are cached in DEDUP_DB, so later runs only ask the server
+    for memos updated since the newest cached one.
+    """
+    rows = _dedup_db.execute(
+        "SELECT sig FROM memo_sig WHERE host=?", (MEMOS_URL,)
+    ).fetchall()
+    existing = {int.from_bytes(sig, "big") for (sig,) in rows}
+    since = _dedup_db.execute(
+        "SELECT MAX(updated) FROM memo_sig WHERE host=?", (MEMOS_URL,)
+    ).fetchone()[0]
+
+    if since:
+        print(
+            f"🔍 Loaded {len(existing)} cached memos, "
+            f"fetching memos updated since then..."
+        )
+        filter_expr = f"updated_ts >= {int(since)}"
+    else:
+        print("🔍 Fetching existing memos to prevent duplicates...")
+        filter_expr = None
+
+    complete = False
+    fetched = []
     page_token = None
     page_count = 0
     max_pages = 100
@@ -42,30 +125,52 @@ def fetch_existing_memos():
     try:
         while page_count < max_pages:
             page_count += 1
-            url = f"{MEMOS_URL}/api/v1/memos?pageSize=100"
+            params = {"pageSize": 100}
             if page_token:
-                url += f"&pageToken={page_token}"
+                params["pageToken"] = page_token
+            if filter_expr:
+                params["filter"] = filter_expr
 
             try:
-                response = requests.get(url, headers=headers, timeout=30)
+                response = SESSION.get(
+                    f"{MEMOS_URL}/api/v1/memos",
+                    params=params,
+                    headers=headers,
+                    timeout=30,
+                )
+                if (
+                    response.status_code == 400
+                    and filter_expr
+                    and page_count == 1
+                ):
+                    print(
+                        "  ⚠️ Server rejected the update filter, "
+                        "fetching all memos"
+                    )
+                    filter_expr = None
+                    page_count = 0
+                    continue
                 response.raise_for_status()
 
                 data = response.json()
                 memos = data.get("memos", [])
 
                 if not memos:
+                    complete = True
                     break
 
                 for memo in memos:
                     content = memo.get("content", "")
                     if content:
-                        sig = hashlib.md5(content.encode()).hexdigest()
+                        sig = text_signature(content)
                         existing.add(sig)
+                        fetched.append((memo, sig))
 
                 print(f"  📄 Page {page_count}: {len(memos)} memos")
 
                 page_token = data.get("nextPageToken")
                 if not page_token:
+                    complete = True
                     break
 
                 time.sleep(0.5)
@@ -75,6 +180,10 @@ def fetch_existing_memos():
                     break
                 raise
 
+        # Only a complete listing may move the cache's high-water mark
+        if complete:
+            save_memo_signatures(fetched)
+
         print(f"✅ Found {len(existing)} existing memos\n")
         return existing
 
@@ -83,6 +192,35 @@ def fetch_existing_memos():
         return existing
 
 
+def save_memo_signatures(fetched):
+    """Store (memo, signature) pairs in the dedup cache in one transaction."""
+    rows = []
+    for memo, sig in fetched:
+        update_time = memo.get("updateTime") or memo.get("createTime")
+        try:
+            updated = parse_iso_datetime(update_time).timestamp()
+        except (AttributeError, TypeError, ValueError):
+            updated = 0
+        rows.append((MEMOS_URL, memo.get("name"), sig.to_bytes(8, "big"), updated))
+
+    with _dedup_db:
+        _dedup_db.executemany(
+            "INSERT OR REPLACE INTO memo_sig VALUES (?, ?, ?, ?)", rows
+        )
+
+
+def build_attachment_body(content, filename, mime_type, memo_name):
+    """Serialize the attachment JSON body without a base64 str copy."""
+    meta = json.dumps({"filename": filename, "type": mime_type, "memo": memo_name})
+    # Base64 output never needs JSON escaping, so splice the raw bytes in
+    return (
+        meta[:-1].encode("utf-8")
+        + b', "content": "'
+        + base64.b64encode(content)
+        + b'"}'
+    )
+
+
 def upload_image_to_memos(img_url, memo_name):
     """Downloads image and uploads to Memos."""
     try:
@@ -90,8 +228,12 @@ def upload_image_to_memos(img_url, memo_name):
             img_url = img_url.split("?")[0]
         img_url += "?format=jpg&name=large"
 
-        resp = requests.get(img_url, timeout=15)
-        resp.raise_for_status()
+        # Stream into one buffer rather than resp.content's joined copy
+        with SESSION.get(img_url, timeout=15, stream=True) as resp:
+            resp.raise_for_status()
+            content = bytearray()
+            for chunk in resp.iter_content(chunk_size=65536):
+                content.extend(chunk)
 
         filename = img_url.split("/")[-1].split("?")[0]
         if not any(
@@ -100,21 +242,33 @@ def upload_image_to_memos(img_url, memo_name):
         ):
             filename += ".jpg"
 
-        encoded = base64.b64encode(resp.content).decode("utf-8")
-
-        payload = {
-            "filename": filename,
-            "content": encoded,
-            "type": "image/jpeg",
-            "memo": memo_name,
-        }
-
-        res = requests.post(
-            f"{MEMOS_URL}/api/v1/attachments",
-            json=payload,
-            headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
-            timeout=30,
-        )
+        if USE_MULTIPART:
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                files={"file": (filename, content, "image/jpeg")},
+                data={
+                    "memo": memo_name,
+                    "filename": filename,
+                    "type": "image/jpeg",
+                },
+                headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
+                timeout=30,
+            )
+        else:
+            body = build_attachment_body(
+                content, filename, "image/jpeg", memo_name
+            )
+            del content
+
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                data=body,
+                headers={
+                    "Authorization": f"Bearer {MEMOS_TOKEN}",
+                    "Content-Type": "application/json",
+                },
+                timeout=30,
+            )
         res.raise_for_status()
         return res.json().get("name")
 
@@ -157,45 +311,59 @@ def export_cookies_to_file(context):
         return None
 
 
+# One YoutubeDL per upload thread: instances are not thread-safe, but
+# reusing one keeps the extractors and cookie jar loaded between videos
+_ytdl_local = threading.local()
+
+
+def get_youtube_dl(cookie_file=None):
+    """Return this thread's YoutubeDL, built once per cookie file."""
+    ydl = getattr(_ytdl_local, "ydl", None)
+    if ydl is None or _ytdl_local.cookie_file != cookie_file:
+        options = {
+            "quiet": True,
+            "no_warnings": True,
+            "format": "best[ext=mp4]/best",
+            "outtmpl": "twitter_video_%(id)s.%(ext)s",
+            "playlist_items": "1",
+            "socket_timeout": 30,
+        }
+        if cookie_file and os.path.exists(cookie_file):
+            options["cookiefile"] = cookie_file
+        ydl = YoutubeDL(options)
+        _ytdl_local.ydl = ydl
+        _ytdl_local.cookie_file = cookie_file
+    return ydl
+
+
 def download_video_with_ytdlp(tweet_url, cookie_file=None):
     """Downloads video using yt-dlp and returns the file path."""
     try:
-        temp_file = (
-            f"twitter_video_{hashlib.md5(tweet_url.encode()).hexdigest()[:8]}.mp4"
-        )
-
         print(f"  📹 Downloading video with yt-dlp...")
 
-        cmd = [
-            "yt-dlp",
-            "--quiet",
-            "--no-warnings",
-            "--format",
-            "best[ext=mp4]/best",
-            "--output",
-            temp_file,
-        ]
-
         if cookie_file and os.path.exists(cookie_file):
-            cmd.extend(["--cookies", cookie_file])
             print(f"  🔐 Using authentication cookies")
 
-        cmd.append(tweet_url)
+        ydl = get_youtube_dl(cookie_file)
+        info = ydl.extract_info(tweet_url, download=True)
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=60
-        )
+        # Tweets with several videos come back as a playlist
+        if info and info.get("_type") == "playlist":
+            entries = info.get("entries") or []
+            info = entries[0] if entries else None
+
+        temp_file = None
+        if info:
+            downloads = info.get("requested_downloads") or [{}]
+            temp_file = downloads[0].get("filepath") or ydl.prepare_filename(info)
 
-        if result.returncode == 0 and os.path.exists(temp_file):
+        if temp_file and os.path.exists(temp_file):
             print(f"  ✅ Video downloaded: {temp_file}")
             return temp_file
         else:
-            print(f"  ⚠️ yt-dlp failed: {result.stderr}")
+            print(f"  ⚠️ yt-dlp failed: no file downloaded")
             return None
 
-    except subprocess.TimeoutExpired:
-        print(f"  ⚠️ Video download timeout")
-        return None
     except Exception as e:
         print(f"  ⚠️ Error downloading video: {e}")
         return None
@@ -212,22 +380,36 @@ def upload_video_to_memos(video_path, memo_name):
             f"  📤 Uploading video ({file_size / 1024 / 1024:.2f} MB)..."
         )
 
-        with open(video_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode("utf-8")
-
-        payload = {
-            "filename": os.path.basename(video_path),
-            "content": encoded,
-            "type": "video/mp4",
-            "memo": memo_name,
-        }
+        filename = os.path.basename(video_path)
+
+        if USE_MULTIPART:
+            with open(video_path, "rb") as f:
+                res = SESSION.post(
+                    f"{MEMOS_URL}/api/v1/attachments",
+                    files={"file": (filename, f, "video/mp4")},
+                    data={
+                        "memo": memo_name,
+                        "filename": filename,
+                        "type": "video/mp4",
+                    },
+                    headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
+                    timeout=120,
+                )
+        else:
+            with open(video_path, "rb") as f:
+                body = build_attachment_body(
+                    f.read(), filename, "video/mp4", memo_name
+                )
 
-        res = requests.post(
-            f"{MEMOS_URL}/api/v1/attachments",
-            json=payload,
-            headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
-            timeout=120,
-        )
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                data=body,
+                headers={
+                    "Authorization": f"Bearer {MEMOS_TOKEN}",
+                    "Content-Type": "application/json",
+                },
+                timeout=120,
+            )
         res.raise_for_status()
 
         attachment_name = res.json().get("name")
@@ -246,6 +428,14 @@ def upload_video_to_memos(video_path, memo_name):
                 pass
 
 
+def download_and_upload_video(video_url, memo_name, cookie_file=None):
+    """Download a tweet's video with yt-dlp and attach it to the memo."""
+    video_path = download_video_with_ytdlp(video_url, cookie_file)
+    if video_path:
+        return upload_video_to_memos(video_path, memo_name)
+    return None
+
+
 def create_memo(
     text, timestamp, images, video_url=None, cookie_file=None
 ):
@@ -257,7 +447,7 @@ def create_memo(
     }
 
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{MEMOS_URL}/api/v1/memos",
             json=payload,
             headers=headers,
@@ -272,25 +462,74 @@ def create_memo(
         if timestamp:
             patch_url = f"{MEMOS_URL}/api/v1/{memo_name}"
             patch_payload = {"createTime": timestamp}
-            patch_response = requests.patch(
+            patch_response = SESSION.patch(
                 patch_url, json=patch_payload, headers=headers, timeout=30
             )
 
             if patch_response.status_code == 200:
                 print(f"  📅 Timestamp: {timestamp}")
 
-        for img_url in images:
-            attachment = upload_image_to_memos(img_url, memo_name)
-            if attachment:
+        # Images and the video are independent, so upload them in parallel
+        image_futures = [
+            _upload_pool.submit(upload_image_to_memos, img_url, memo_name)
+            for img_url in images
+        ]
+        video_future = None
+        if video_url:
+            video_future = _upload_pool.submit(
+                download_and_upload_video, video_url, memo_name, cookie_file
+            )
+
+        for future in as_completed(image_futures):
+            if future.result():
                 print(f"  📎 Image attached")
 
-        if video_url:
-            video_path = download_video_with_ytdlp(video_url, cookie_file)
-            if video_path:
-                upload_video_to_memos(video_path, memo_name)
+        if video_future:
+            video_future.result()
+
+        return memo_name
 
     except Exception as e:
         print(f"❌ Failed to create memo: {e}")
+        return None
+
+
+class MemoWriter:
+    """Creates memos on a background thread so scrolling never waits.
+
+    The bounded queue applies backpressure when uploads fall behind.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize=32):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+            tweet_data, cookie_file = item
+            create_memo(
+                tweet_data["text"],
+                tweet_data["timestamp"],
+                tweet_data["images"],
+                tweet_data["video_url"],
+                cookie_file,
+            )
+            time.sleep(0.5)
+
+    def submit(self, tweet_data, cookie_file=None):
+        """Queue a scraped tweet, blocking while the queue is full."""
+        self.queue.put((tweet_data, cookie_file))
+
+    def close(self):
+        """Wait for every queued memo to be created."""
+        self.queue.put(self._STOP)
+        self.thread.join()
 
 
 def create_auth_json(auth_token, ct0_token):
@@ -325,44 +564,32 @@ def create_auth_json(auth_token, ct0_token):
     print("✅ Created auth.json from tokens!")
 
 
-def parse_twitter_timestamp(time_element):
-    """Extract Twitter timestamp in ISO format."""
-    try:
-        datetime_attr = time_element.get_attribute("datetime")
-        return datetime_attr if datetime_attr else None
-    except Exception:
-        return None
-
-
-def extract_tweet_url(tweet_element):
-    """Extract the tweet URL from the tweet element."""
-    try:
-        link = tweet_element.locator('a[href*="/status/"]').first
-        if link.count() > 0:
-            href = link.get_attribute("href")
-            if href:
-                if href.startswith("/"):
-                    return f"https://x.com{href}"
-                return href
-    except Exception:
-        pass
-    return None
-
-
-def process_tweet(tweet, existing_memos, cookie_file=None):
-    """Process a single tweet element and return its data."""
+# Collects every field process_tweet needs for all unread tweets in one
+# in-page call, instead of a CDP round-trip per locator/count/attribute lookup
+TWEETS_JS = """
+() => [...document.querySelectorAll('article[data-testid="tweet"]:not([data-scraped])')]
+    .map(el => {
+        const texts = [...el.querySelectorAll('div[data-testid="tweetText"]')]
+            .map(n => n.innerText)
+            .filter(t => t);
+        // Tag articles once their text has rendered so later scans skip them
+        if (texts.length) el.setAttribute('data-scraped', '1');
+        return {
+            texts,
+            timestamp: el.querySelector('time')?.getAttribute('datetime') || null,
+            images: [...el.querySelectorAll('img[src*="pbs.twimg.com/media"]')]
+                .map(i => i.getAttribute('src')),
+            hasVideo: !!el.querySelector('video'),
+            href: el.querySelector('a[href*="/status/"]')?.getAttribute('href') || null,
+        };
+    })
+"""
+
+
+def process_tweet(fields, existing_memos, cookie_file=None):
+    """Process the fields read by TWEETS_JS for one tweet and return its data."""
     try:
-        text_elements = tweet.locator('div[data-testid="tweetText"]')
-        text_count = text_elements.count()
-
-        texts = []
-        for i in range(text_count):
-            try:
-                txt = text_elements.nth(i).inner_text()
-                if txt:
-                    texts.append(txt)
-            except:
-                continue
+        texts = fields["texts"]
 
         if not texts:
             return None
@@ -373,31 +600,19 @@ def process_tweet(tweet, existing_memos, cookie_file=None):
             text = texts[0]
 
         # Check for duplicate
-        content_sig = hashlib.md5(text.encode()).hexdigest()
+        content_sig = text_signature(text)
         if content_sig in existing_memos:
             return None
 
-        time_element = tweet.locator("time").first
-        timestamp = None
-        if time_element.count() > 0:
-            timestamp = parse_twitter_timestamp(time_element)
-
-        imgs_el = tweet.locator('img[src*="pbs.twimg.com/media"]')
-        images = [
-            imgs_el.nth(i).get_attribute("src")
-            for i in range(imgs_el.count())
-        ]
+        timestamp = fields["timestamp"]
+        images = fields["images"]
 
         video_url = None
-        video_element = tweet.locator("video")
-        if video_element.count() > 0:
-            tweet_url = extract_tweet_url(tweet)
-            if tweet_url:
-                video_url = tweet_url
+        href = fields["href"]
+        if fields["hasVideo"] and href:
+            video_url = f"https://x.com{href}" if href.startswith("/") else href
 
-        sig = hashlib.md5(
-            f"{text}{timestamp}{len(images)}{bool(video_url)}".encode()
-        ).hexdigest()
+        sig = text_signature(f"{text}{timestamp}{len(images)}{bool(video_url)}")
 
         return {
             "text": text,
@@ -413,8 +628,15 @@ def process_tweet(tweet, existing_memos, cookie_file=None):
         return None
 
 
+def parse_iso_datetime(value):
+    """Parse an ISO 8601 timestamp, including a trailing 'Z'."""
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 def scrape_profile_timeline(
-    page, existing_memos, cookie_file=None, max_scrolls=50
+    page, writer, existing_memos, cookie_file=None, max_scrolls=50
 ):
     """Fast scrolling method for recent tweets."""
     print(f"\n{'='*60}")
@@ -443,8 +665,8 @@ def scrape_profile_timeline(
     oldest_timestamp = None
 
     while scroll_attempts < max_scrolls:
-        tweets = page.locator('article[data-testid="tweet"]').all()
-        print(f"👀 Scanning {len(tweets)} visible tweets...")
+        tweets = page.evaluate(TWEETS_JS)
+        print(f"👀 Scanning {len(tweets)} new tweets...")
 
         found_new = False
         for tweet in tweets:
@@ -462,16 +684,15 @@ def scrape_profile_timeline(
             found_new = True
             new_tweets += 1
 
-            # Track oldest timestamp
+            # Track oldest timestamp; X's datetime attributes share one
+            # fixed-width UTC format, so they order correctly as strings
+            # and only the winner needs parsing
             if tweet_data["timestamp"]:
-                tweet_date = datetime.fromisoformat(
-                    tweet_data["timestamp"].replace("Z", "+00:00")
-                )
                 if (
                     oldest_timestamp is None
-                    or tweet_date < oldest_timestamp
+                    or tweet_data["timestamp"] < oldest_timestamp
                 ):
-                    oldest_timestamp = tweet_date
+                    oldest_timestamp = tweet_data["timestamp"]
 
             print(
                 f"📥 New [{new_tweets}]: {tweet_data['text'][:50].replace(chr(10), ' ')}..."
@@ -479,14 +700,7 @@ def scrape_profile_timeline(
             if tweet_data["timestamp"]:
                 print(f"  📅 Date: {tweet_data['timestamp']}")
 
-            create_memo(
-                tweet_data["text"],
-                tweet_data["timestamp"],
-                tweet_data["images"],
-                tweet_data["video_url"],
-                cookie_file,
-            )
-            time.sleep(0.5)
+            writer.submit(tweet_data, cookie_file)
 
         if not found_new:
             no_new_scrolls += 1
@@ -502,6 +716,9 @@ def scrape_profile_timeline(
         time.sleep(3)
         scroll_attempts += 1
 
+    if oldest_timestamp:
+        oldest_timestamp = parse_iso_datetime(oldest_timestamp)
+
     print(f"\n📊 Phase 1 Summary:")
     print(f"  ✅ New tweets: {new_tweets}")
     print(f"  ⏭️  Duplicates skipped: {duplicate_count}")
@@ -514,7 +731,7 @@ def scrape_profile_timeline(
 
 
 def scrape_date_range(
-    page, start_date, end_date, existing_memos, cookie_file=None
+    page, writer, start_date, end_date, existing_memos, cookie_file=None
 ):
     """Scrape tweets from a specific date range using search."""
     start_str = start_date.strftime("%Y-%m-%d")
@@ -556,7 +773,7 @@ def scrape_date_range(
     no_new_scrolls = 0
 
     while scroll_attempts < MAX_SCROLLS:
-        tweets = page.locator('article[data-testid="tweet"]').all()
+        tweets = page.evaluate(TWEETS_JS)
 
         found_new = False
         for tweet in tweets:
@@ -578,14 +795,7 @@ def scrape_date_range(
                 f"📥 New [{new_tweets}]: {tweet_data['text'][:50].replace(chr(10), ' ')}..."
             )
 
-            create_memo(
-                tweet_data["text"],
-                tweet_data["timestamp"],
-                tweet_data["images"],
-                tweet_data["video_url"],
-                cookie_file,
-            )
-            time.sleep(0.5)
+            writer.submit(tweet_data, cookie_file)
 
         if not found_new:
             no_new_scrolls += 1
@@ -615,7 +825,7 @@ def generate_date_ranges(start_date, end_date, chunk_days=5):
 
 
 def scrape_historical(
-    page, oldest_date, existing_memos, cookie_file=None
+    page, writer, oldest_date, existing_memos, cookie_file=None
 ):
     """Scrape historical tweets using date range search."""
     print(f"\n{'='*60}")
@@ -647,7 +857,12 @@ def scrape_historical(
         print(f"\n🔄 Progress: {idx}/{len(date_ranges)}")
         try:
             new_count, dup_count = scrape_date_range(
-                page, range_start, range_end, existing_memos, cookie_file
+                page,
+                writer,
+                range_start,
+                range_end,
+                existing_memos,
+                cookie_file,
             )
             total_new += new_count
             total_duplicates += dup_count
@@ -709,18 +924,25 @@ def main():
 
         cookie_file = export_cookies_to_file(context)
 
-        # Phase 1: Fast timeline scrolling
-        timeline_count, oldest_timestamp = scrape_profile_timeline(
-            page, existing_memos, cookie_file, MAX_SCROLLS
-        )
-
-        # Phase 2: Historical search if needed
-        historical_count = 0
-        if oldest_timestamp:
-            historical_count, _ = scrape_historical(
-                page, oldest_timestamp, existing_memos, cookie_file
+        # Memos are created in the background while the page keeps scrolling
+        writer = MemoWriter()
+        try:
+            # Phase 1: Fast timeline scrolling
+            timeline_count, oldest_timestamp = scrape_profile_timeline(
+                page, writer, existing_memos, cookie_file, MAX_SCROLLS
             )
 
+            # Phase 2: Historical search if needed
+            historical_count = 0
+            if oldest_timestamp:
+                historical_count, _ = scrape_historical(
+                    page, writer, oldest_timestamp, existing_memos, cookie_file
+                )
+        finally:
+            # Finish queued uploads before the cookie file is removed
+            print("\n⏳ Waiting for queued memos...")
+            writer.close()
+
         # Cleanup
         if cookie_file and os.path.exists(cookie_file):
             try:
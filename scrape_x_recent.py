@@ -4,9 +4,18 @@ import hashlib
 import base64
 import requests
 import json
-import subprocess
+import functools
+import threading
+import http.cookiejar
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from playwright.sync_api import sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from yt_dlp import YoutubeDL
 from dotenv import load_dotenv
+from datetime import datetime
 
 load_dotenv()
 
@@ -17,57 +26,157 @@ TARGET_USERNAME = os.getenv("X_USERNAME")
 MAX_SCROLLS = int(os.getenv("X_MAX_SCROLLS"))
 TWITTER_AUTH_TOKEN = os.getenv("X_AUTH_TOKEN")
 TWITTER_CT0 = os.getenv("X_CT0")
+# Send attachments as raw multipart/form-data instead of base64 JSON.
+# Only enable this if your Memos server accepts multipart uploads.
+USE_MULTIPART = os.getenv("MEMOS_MULTIPART_UPLOAD", "false").lower() == "true"
+# Local cache of existing-memo signatures, reused across runs
+DEDUP_DB = "memos_dedup.db"
 # ---------------------
 
 
+def create_session_with_retries() -> requests.Session:
+    """Create a pooled requests session with automatic retries."""
+    session = requests.Session()
+    # Default allowed methods: POSTs are never replayed, so no double memos
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    # Sized for the image and video pools plus the main thread
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=32,
+        pool_maxsize=32,
+        pool_block=False,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Keep-alive connections shared by every Memos and image request
+SESSION = create_session_with_retries()
+
+# A tweet carries at most four images, uploaded side by side
+UPLOAD_WORKERS = 4
+_upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+
+# Recently downloaded images kept for retweets and repeats of the same media
+IMAGE_CACHE_SIZE = 64
+
+# Video downloads run in the background so scrolling is never blocked;
+# kept small so X does not throttle the downloads
+VIDEO_WORKERS = 4
+_video_pool = ThreadPoolExecutor(max_workers=VIDEO_WORKERS)
+
+_dedup_db = sqlite3.connect(DEDUP_DB)
+_dedup_db.execute(
+    "CREATE TABLE IF NOT EXISTS memo_sig ("
+    "host TEXT, name TEXT, sig BLOB, updated REAL, PRIMARY KEY (host, name))"
+)
+
+
+def text_signature(text):
+    """64-bit integer signature used for duplicate detection."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
 def fetch_existing_memos():
-    """Fetch all existing memos to check for duplicates."""
-    print("🔍 Fetching existing memos to prevent duplicates...")
-    existing = set()
+    """Fetch all existing memos to check for duplicates.
+
+    Signatures are cached in DEDUP_DB, so later runs only ask the server
+    for memos updated since the newest cached one.
+    """
+    rows = _dedup_db.execute(
+        "SELECT sig FROM memo_sig WHERE host=?", (MEMOS_URL,)
+    ).fetchall()
+    existing = {int.from_bytes(sig, "big") for (sig,) in rows}
+    since = _dedup_db.execute(
+        "SELECT MAX(updated) FROM memo_sig WHERE host=?", (MEMOS_URL,)
+    ).fetchone()[0]
+
+    if since:
+        print(
+            f"🔍 Loaded {len(existing)} cached memos, "
+            f"fetching memos updated since then..."
+        )
+        filter_expr = f"updated_ts >= {int(since)}"
+    else:
+        print("🔍 Fetching existing memos to prevent duplicates...")
+        filter_expr = None
+
     page_token = None
     page_count = 0
     max_pages = 100
+    fetched = []
+    complete = False
 
     headers = {"Authorization": f"Bearer {MEMOS_TOKEN}"}
 
     try:
         while page_count < max_pages:
             page_count += 1
-            url = f"{MEMOS_URL}/api/v1/memos?pageSize=100"
+            params = {"pageSize": 100}
             if page_token:
-                url += f"&pageToken={page_token}"
+                params["pageToken"] = page_token
+            if filter_expr:
+                params["filter"] = filter_expr
 
             try:
-                response = requests.get(url, headers=headers, timeout=30)
+                response = SESSION.get(
+                    f"{MEMOS_URL}/api/v1/memos",
+                    params=params,
+                    headers=headers,
+                    timeout=30,
+                )
+                if (
+                    response.status_code == 400
+                    and filter_expr
+                    and page_count == 1
+                ):
+                    print(
+                        "  ⚠️ Server rejected the update filter, "
+                        "fetching all memos"
+                    )
+                    filter_expr = None
+                    page_count = 0
+                    continue
                 response.raise_for_status()
 
-                data = response.json()
+                data = json.loads(response.content)
                 memos = data.get("memos", [])
 
                 if not memos:
                     print(f"  📄 No more memos on page {page_count}")
+                    complete = True
                     break
 
                 for memo in memos:
                     content = memo.get("content", "")
                     if content:
-                        sig = hashlib.md5(content.encode()).hexdigest()
+                        sig = text_signature(content)
                         existing.add(sig)
+                        fetched.append((memo, sig))
 
                 print(f"  📄 Fetched page {page_count} ({len(memos)} memos)")
 
                 page_token = data.get("nextPageToken")
                 if not page_token:
+                    complete = True
                     break
 
-                time.sleep(0.5)
-
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 400:
                     print(f"  ⚠️ Pagination ended at page {page_count}")
                     break
                 raise
 
+        # Only a complete listing may move the cache's high-water mark
+        if complete:
+            save_memo_signatures(fetched)
+
         print(f"✅ Found {len(existing)} existing memos\n")
         return existing
 
@@ -77,6 +186,86 @@ def fetch_existing_memos():
         return existing
 
 
+def save_memo_signatures(fetched):
+    """Store (memo, signature) pairs in the dedup cache in one transaction."""
+    rows = []
+    for memo, sig in fetched:
+        update_time = memo.get("updateTime") or memo.get("createTime")
+        try:
+            updated = datetime.fromisoformat(
+                update_time.replace("Z", "+00:00")
+            ).timestamp()
+        except (AttributeError, ValueError):
+            updated = 0
+        rows.append((MEMOS_URL, memo.get("name"), sig.to_bytes(8, "big"), updated))
+
+    with _dedup_db:
+        _dedup_db.executemany(
+            "INSERT OR REPLACE INTO memo_sig VALUES (?, ?, ?, ?)", rows
+        )
+
+
+def build_attachment_body(content, filename, mime_type, memo_name):
+    """Serialize the attachment JSON body without a base64 str copy."""
+    meta = json.dumps({"filename": filename, "type": mime_type, "memo": memo_name})
+    # Base64 output never needs JSON escaping, so splice the raw bytes in
+    return (
+        meta[:-1].encode("utf-8")
+        + b', "content": "'
+        + base64.b64encode(content)
+        + b'"}'
+    )
+
+
+class AttachmentBody:
+    """Attachment JSON body that base64-encodes a file as it is sent.
+
+    The encoded length is known up front, so requests sends a plain
+    Content-Length body rather than chunked transfer encoding.
+    """
+
+    # Multiples of 3 bytes encode without padding, so chunks concatenate
+    CHUNK_SIZE = 3 * 65536
+
+    def __init__(self, path, filename, mime_type, memo_name):
+        meta = json.dumps(
+            {"filename": filename, "type": mime_type, "memo": memo_name}
+        )
+        self.path = path
+        self.prefix = meta[:-1].encode("utf-8") + b', "content": "'
+        self.suffix = b'"}'
+        self.size = os.path.getsize(path)
+
+    def __len__(self):
+        encoded = 4 * ((self.size + 2) // 3)
+        return len(self.prefix) + encoded + len(self.suffix)
+
+    def __iter__(self):
+        yield self.prefix
+        with open(self.path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                yield base64.b64encode(chunk)
+        yield self.suffix
+
+
+@functools.lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def download_image(img_url):
+    """Download an image once per run; repeats reuse the cached bytes."""
+    # Stream the body; cached results are shared, so keep them immutable
+    with SESSION.get(img_url, timeout=15, stream=True) as resp:
+        resp.raise_for_status()
+        content = b"".join(resp.iter_content(chunk_size=65536))
+
+    filename = img_url.split("/")[-1].split("?")[0]
+    if not any(
+        filename.endswith(ext)
+        for ext in [".jpg", ".jpeg", ".png", ".gif", ".webp"]
+    ):
+        filename += ".jpg"
+
+    return filename, content
+
+
 def upload_image_to_memos(img_url, memo_name):
     """Downloads image and uploads to Memos."""
     try:
@@ -84,31 +273,34 @@ def upload_image_to_memos(img_url, memo_name):
             img_url = img_url.split("?")[0]
         img_url += "?format=jpg&name=large"
 
-        resp = requests.get(img_url, timeout=15)
-        resp.raise_for_status()
-
-        filename = img_url.split("/")[-1].split("?")[0]
-        if not any(
-            filename.endswith(ext)
-            for ext in [".jpg", ".jpeg", ".png", ".gif", ".webp"]
-        ):
-            filename += ".jpg"
-
-        encoded = base64.b64encode(resp.content).decode("utf-8")
-
-        payload = {
-            "filename": filename,
-            "content": encoded,
-            "type": "image/jpeg",
-            "memo": memo_name,
-        }
+        filename, content = download_image(img_url)
+
+        if USE_MULTIPART:
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                files={"file": (filename, content, "image/jpeg")},
+                data={
+                    "memo": memo_name,
+                    "filename": filename,
+                    "type": "image/jpeg",
+                },
+                headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
+                timeout=30,
+            )
+        else:
+            body = build_attachment_body(
+                content, filename, "image/jpeg", memo_name
+            )
 
-        res = requests.post(
-            f"{MEMOS_URL}/api/v1/attachments",
-            json=payload,
-            headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
-            timeout=30,
-        )
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                data=body,
+                headers={
+                    "Authorization": f"Bearer {MEMOS_TOKEN}",
+                    "Content-Type": "application/json",
+                },
+                timeout=30,
+            )
         res.raise_for_status()
         return res.json().get("name")
 
@@ -117,79 +309,96 @@ def upload_image_to_memos(img_url, memo_name):
         return None
 
 
-def export_cookies_to_file(context):
-    """Export Playwright cookies to a file for yt-dlp."""
+def export_cookies(context):
+    """Convert Playwright cookies into cookiejar cookies for yt-dlp."""
     try:
-        cookies = context.cookies()
-        cookie_file = "twitter_cookies.txt"
-
-        with open(cookie_file, "w") as f:
-            f.write("# Netscape HTTP Cookie File\n")
-            f.write("# This is a generated file! Do not edit.\n\n")
-
-            for cookie in cookies:
-                domain = cookie["domain"]
-                flag = "TRUE" if domain.startswith(".") else "FALSE"
-                secure = "TRUE" if cookie["secure"] else "FALSE"
-                expiry = (
-                    str(int(cookie.get("expires", 0)))
-                    if cookie.get("expires", 0) > 0
-                    else "0"
-                )
-                path = cookie.get("path", "/")
-                name = cookie["name"]
-                value = cookie["value"]
-
-                f.write(
-                    f"{domain}\t{flag}\t{path}\t{secure}\t{expiry}\t{name}\t{value}\n"
+        cookies = []
+        for cookie in context.cookies():
+            domain = cookie["domain"]
+            expires = cookie.get("expires", 0)
+            cookies.append(
+                http.cookiejar.Cookie(
+                    version=0,
+                    name=cookie["name"],
+                    value=cookie["value"],
+                    port=None,
+                    port_specified=False,
+                    domain=domain,
+                    domain_specified=True,
+                    domain_initial_dot=domain.startswith("."),
+                    path=cookie.get("path", "/"),
+                    path_specified=True,
+                    secure=cookie["secure"],
+                    expires=int(expires) if expires > 0 else None,
+                    discard=expires <= 0,
+                    comment=None,
+                    comment_url=None,
+                    rest={},
                 )
+            )
 
         print(f"  📄 Exported cookies for yt-dlp")
-        return cookie_file
+        return cookies
     except Exception as e:
         print(f"  ⚠️ Failed to export cookies: {e}")
         return None
 
 
-def download_video_with_ytdlp(tweet_url, cookie_file=None):
-    """Downloads video using yt-dlp and returns the file path."""
-    try:
-        temp_file = (
-            f"twitter_video_{hashlib.md5(tweet_url.encode()).hexdigest()[:8]}.mp4"
+# One YoutubeDL per video thread: instances are not thread-safe, but
+# reusing one keeps the extractors and cookie jar loaded between videos
+_ytdl_local = threading.local()
+
+
+def get_youtube_dl(cookies=None):
+    """Return this thread's YoutubeDL, built once per cookie list."""
+    ydl = getattr(_ytdl_local, "ydl", None)
+    if ydl is None or _ytdl_local.cookies is not cookies:
+        ydl = YoutubeDL(
+            {
+                "quiet": True,
+                "no_warnings": True,
+                "format": "best[ext=mp4]/best",
+                "outtmpl": "twitter_video_%(id)s.%(ext)s",
+                "playlist_items": "1",
+                "socket_timeout": 30,
+            }
         )
+        # Load the browser session straight into yt-dlp's jar, no file
+        for cookie in cookies or []:
+            ydl.cookiejar.set_cookie(cookie)
+        _ytdl_local.ydl = ydl
+        _ytdl_local.cookies = cookies
+    return ydl
 
-        print(f"  📹 Downloading video with yt-dlp...")
 
-        cmd = [
-            "yt-dlp",
-            "--quiet",
-            "--no-warnings",
-            "--format",
-            "best[ext=mp4]/best",
-            "--output",
-            temp_file,
-        ]
+def download_video_with_ytdlp(tweet_url, cookies=None):
+    """Downloads video using yt-dlp and returns the file path."""
+    try:
+        print(f"  📹 Downloading video with yt-dlp...")
 
-        if cookie_file and os.path.exists(cookie_file):
-            cmd.extend(["--cookies", cookie_file])
+        if cookies:
             print(f"  🔐 Using authentication cookies")
 
-        cmd.append(tweet_url)
+        ydl = get_youtube_dl(cookies)
+        info = ydl.extract_info(tweet_url, download=True)
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=60
-        )
+        # Tweets with several videos come back as a playlist
+        if info and info.get("_type") == "playlist":
+            entries = info.get("entries") or []
+            info = entries[0] if entries else None
+
+        temp_file = None
+        if info:
+            downloads = info.get("requested_downloads") or [{}]
+            temp_file = downloads[0].get("filepath") or ydl.prepare_filename(info)
 
-        if result.returncode == 0 and os.path.exists(temp_file):
+        if temp_file and os.path.exists(temp_file):
             print(f"  ✅ Video downloaded: {temp_file}")
             return temp_file
         else:
-            print(f"  ⚠️ yt-dlp failed: {result.stderr}")
+            print(f"  ⚠️ yt-dlp failed: no file downloaded")
             return None
 
-    except subprocess.TimeoutExpired:
-        print(f"  ⚠️ Video download timeout")
-        return None
     except Exception as e:
         print(f"  ⚠️ Error downloading video: {e}")
         return None
@@ -206,22 +415,34 @@ def upload_video_to_memos(video_path, memo_name):
             f"  📤 Uploading video ({file_size / 1024 / 1024:.2f} MB)..."
         )
 
-        with open(video_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode("utf-8")
-
-        payload = {
-            "filename": os.path.basename(video_path),
-            "content": encoded,
-            "type": "video/mp4",
-            "memo": memo_name,
-        }
-
-        res = requests.post(
-            f"{MEMOS_URL}/api/v1/attachments",
-            json=payload,
-            headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
-            timeout=120,
-        )
+        filename = os.path.basename(video_path)
+
+        if USE_MULTIPART:
+            with open(video_path, "rb") as f:
+                res = SESSION.post(
+                    f"{MEMOS_URL}/api/v1/attachments",
+                    files={"file": (filename, f, "video/mp4")},
+                    data={
+                        "memo": memo_name,
+                        "filename": filename,
+                        "type": "video/mp4",
+                    },
+                    headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
+                    timeout=120,
+                )
+        else:
+            # Encoded and uploaded piece by piece instead of held in memory
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                data=AttachmentBody(
+                    video_path, filename, "video/mp4", memo_name
+                ),
+                headers={
+                    "Authorization": f"Bearer {MEMOS_TOKEN}",
+                    "Content-Type": "application/json",
+                },
+                timeout=120,
+            )
         res.raise_for_status()
 
         attachment_name = res.json().get("name")
@@ -240,18 +461,38 @@ def upload_video_to_memos(video_path, memo_name):
                 pass
 
 
+def download_and_upload_video(video_url, memo_name, cookies=None):
+    """Download a tweet's video with yt-dlp and attach it to the memo."""
+    video_path = download_video_with_ytdlp(video_url, cookies)
+    if video_path:
+        return upload_video_to_memos(video_path, memo_name)
+    return None
+
+
+def same_timestamp(requested, returned):
+    """Check whether two ISO timestamps refer to the same second."""
+    try:
+        requested_dt = datetime.fromisoformat(requested.replace("Z", "+00:00"))
+        returned_dt = datetime.fromisoformat(returned.replace("Z", "+00:00"))
+        return int(requested_dt.timestamp()) == int(returned_dt.timestamp())
+    except Exception:
+        return False
+
+
 def create_memo(
-    text, timestamp, images, video_url=None, cookie_file=None
+    text, timestamp, images, video_url=None, cookies=None
 ):
     """Creates the memo in your self-hosted instance with proper timestamp."""
     payload = {"content": text, "visibility": "PRIVATE"}
+    if timestamp:
+        payload["createTime"] = timestamp
     headers = {
         "Authorization": f"Bearer {MEMOS_TOKEN}",
         "Content-Type": "application/json",
     }
 
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{MEMOS_URL}/api/v1/memos",
             json=payload,
             headers=headers,
@@ -263,10 +504,11 @@ def create_memo(
         memo_name = data.get("name")
         print(f"✅ Memo created: {memo_name}")
 
-        if timestamp:
+        # Servers that ignore createTime on create still need the PATCH
+        if timestamp and not same_timestamp(timestamp, data.get("createTime")):
             patch_url = f"{MEMOS_URL}/api/v1/{memo_name}"
             patch_payload = {"createTime": timestamp}
-            patch_response = requests.patch(
+            patch_response = SESSION.patch(
                 patch_url,
                 json=patch_payload,
                 headers=headers,
@@ -275,16 +517,21 @@ def create_memo(
 
             if patch_response.status_code == 200:
                 print(f"  📅 Timestamp: {timestamp}")
+        elif timestamp:
+            print(f"  📅 Timestamp: {timestamp}")
 
-        for img_url in images:
-            attachment = upload_image_to_memos(img_url, memo_name)
-            if attachment:
+        image_futures = [
+            _upload_pool.submit(upload_image_to_memos, img_url, memo_name)
+            for img_url in images
+        ]
+        for future in as_completed(image_futures):
+            if future.result():
                 print(f"  📎 Image attached")
 
         if video_url:
-            video_path = download_video_with_ytdlp(video_url, cookie_file)
-            if video_path:
-                upload_video_to_memos(video_path, memo_name)
+            _video_pool.submit(
+                download_and_upload_video, video_url, memo_name, cookies
+            )
 
     except Exception as e:
         print(f"❌ Failed to create memo: {e}")
@@ -322,28 +569,59 @@ def create_auth_json(auth_token, ct0_token):
     print("✅ Created auth.json from tokens!")
 
 
-def parse_twitter_timestamp(time_element):
-    """Extract Twitter timestamp in ISO format."""
-    try:
-        datetime_attr = time_element.get_attribute("datetime")
-        return datetime_attr if datetime_attr else None
-    except Exception:
-        return None
-
-
-def extract_tweet_url(tweet_element):
-    """Extract the tweet URL from the tweet element."""
-    try:
-        link = tweet_element.locator('a[href*="/status/"]').first
-        if link.count() > 0:
-            href = link.get_attribute("href")
-            if href:
-                if href.startswith("/"):
-                    return f"https://x.com{href}"
-                return href
-    except Exception:
-        pass
-    return None
+# Selectors for a tweet and the parts of it that get imported
+TWEET_SELECTOR = 'article[data-testid="tweet"]'
+SELECTORS = {
+    "tweet": TWEET_SELECTOR,
+    "text": 'div[data-testid="tweetText"]',
+    "image": 'img[src*="pbs.twimg.com/media"]',
+    "time": "time",
+    "video": "video",
+    "link": 'a[href*="/status/"]',
+}
+
+# Reads every visible tweet in one call instead of a locator per field.
+# Status IDs are checked first, so tweets already read on an earlier
+# scroll cost one attribute lookup; tailHref is the last article's link.
+TWEETS_JS = """
+sel => {
+    const seen = (window.__scrapedIds ??= new Set());
+    const articles = [...document.querySelectorAll(sel.tweet)];
+    const linkOf = a => a.querySelector(sel.link)?.getAttribute('href') || null;
+    const tweets = [];
+    for (const a of articles) {
+        const href = linkOf(a);
+        const statusId = href?.match(/\\/status\\/(\\d+)/)?.[1] || null;
+        if (statusId && seen.has(statusId)) continue;
+        const texts = [...a.querySelectorAll(sel.text)]
+            .map(n => n.innerText)
+            .filter(t => t);
+        // Tweets whose text has not rendered yet are read again next time
+        if (statusId && texts.length) seen.add(statusId);
+        tweets.push({
+            texts,
+            timestamp: a.querySelector(sel.time)?.getAttribute('datetime') || null,
+            images: [...a.querySelectorAll(sel.image)]
+                .map(i => i.getAttribute('src')),
+            hasVideo: !!a.querySelector(sel.video),
+            href,
+        });
+    }
+    const tail = articles[articles.length - 1];
+    return { tweets, tailHref: tail ? linkOf(tail) : null };
+}
+"""
+
+# True once the last tweet in the DOM is no longer the one seen before scrolling
+TIMELINE_ADVANCED_JS = """
+([sel, lastHref]) => {
+    const articles = document.querySelectorAll(sel.tweet);
+    const tail = articles[articles.length - 1];
+    const href = tail?.querySelector(sel.link)?.getAttribute('href') || null;
+    return !!tail && href !== lastHref;
+}
+"""
+SCROLL_WAIT_MS = 3000
 
 
 def scrape_x():
@@ -402,7 +680,7 @@ def scrape_x():
         page = context.new_page()
 
         # Export cookies for video downloads
-        cookie_file = export_cookies_to_file(context)
+        cookies = export_cookies(context)
 
         # Fetch existing memos for duplicate detection
         existing_memos = fetch_existing_memos()
@@ -413,7 +691,7 @@ def scrape_x():
         )
 
         try:
-            page.wait_for_selector('article[data-testid="tweet"]', timeout=15000)
+            page.wait_for_selector(TWEET_SELECTOR, timeout=15000)
             print("✅ Tweets loaded!")
         except Exception as e:
             print(f"❌ Failed to load tweets: {e}")
@@ -428,25 +706,15 @@ def scrape_x():
         scroll_attempts = 0
 
         while scroll_attempts < MAX_SCROLLS:
-            tweets = page.locator('article[data-testid="tweet"]').all()
-            print(f"👀 Scanning {len(tweets)} visible tweets...")
+            scan = page.evaluate(TWEETS_JS, SELECTORS)
+            tweets = scan["tweets"]
+            print(f"👀 Scanning {len(tweets)} unseen tweets...")
 
             found_new = False
             for tweet in tweets:
                 try:
-                    # Handle reposts/quotes: collect ALL tweetText elements
-                    text_elements = tweet.locator('div[data-testid="tweetText"]')
-                    text_count = text_elements.count()
-
-                    texts = []
-                    for i in range(text_count):
-                        try:
-                            txt = text_elements.nth(i).inner_text()
-                            if txt:
-                                texts.append(txt)
-                        except:
-                            continue
-
+                    # Handle reposts/quotes: all tweetText elements are collected
+                    texts = tweet["texts"]
                     if not texts:
                         continue
 
@@ -458,38 +726,25 @@ def scrape_x():
                         text = texts[0]
 
                     # Check for duplicate
-                    content_sig = hashlib.md5(text.encode()).hexdigest()
+                    content_sig = text_signature(text)
                     if content_sig in existing_memos:
                         duplicate_count += 1
                         continue
 
-                    # Extract timestamp from <time> element
-                    time_element = tweet.locator("time").first
-                    timestamp = None
-                    if time_element.count() > 0:
-                        timestamp = parse_twitter_timestamp(time_element)
-
-                    # Extract images
-                    imgs_el = tweet.locator('img[src*="pbs.twimg.com/media"]')
-                    images = [
-                        imgs_el.nth(i).get_attribute("src")
-                        for i in range(imgs_el.count())
-                    ]
+                    timestamp = tweet["timestamp"]
+                    images = tweet["images"]
 
-                    # Check for video
+                    # Check for video; yt-dlp needs the tweet URL
                     video_url = None
-                    video_element = tweet.locator("video")
-                    if video_element.count() > 0:
-                        # Get tweet URL for yt-dlp
-                        tweet_url = extract_tweet_url(tweet)
-                        if tweet_url:
-                            video_url = tweet_url
-                            print(f"  🎬 Detected video in tweet")
-
-                    # Create unique signature
-                    sig = hashlib.md5(
-                        f"{text}{timestamp}{len(images)}{bool(video_url)}".encode()
-                    ).hexdigest()
+                    href = tweet["href"]
+                    if tweet["hasVideo"] and href:
+                        video_url = (
+                            f"https://x.com{href}" if href.startswith("/") else href
+                        )
+                        print(f"  🎬 Detected video in tweet")
+
+                    # Unique key: content signature plus metadata, no rehash
+                    sig = (content_sig, timestamp, len(images), bool(video_url))
 
                     if sig not in seen_tweets:
                         seen_tweets.add(sig)
@@ -502,7 +757,7 @@ def scrape_x():
                         if timestamp:
                             print(f"  📅 Date: {timestamp}")
                         create_memo(
-                            text, timestamp, images, video_url, cookie_file
+                            text, timestamp, images, video_url, cookies
                         )
                         time.sleep(0.5)
 
@@ -515,18 +770,21 @@ def scrape_x():
 
             page.evaluate("window.scrollBy(0, window.innerHeight)")
             print("⬇️ Scrolling...")
-            time.sleep(3)
+            # Continue as soon as new tweets render, at most the old 3 s
+            try:
+                page.wait_for_function(
+                    TIMELINE_ADVANCED_JS,
+                    arg=[SELECTORS, scan["tailHref"]],
+                    timeout=SCROLL_WAIT_MS,
+                )
+            except PlaywrightTimeoutError:
+                pass
             scroll_attempts += 1
 
         print(f"\n✅ Finished! Imported {new_tweets} new tweets, skipped {duplicate_count} duplicates.")
-        
-        # Cleanup
-        if cookie_file and os.path.exists(cookie_file):
-            try:
-                os.remove(cookie_file)
-                print("🗑️ Cleaned up cookie file")
-            except:
-                pass
+
+        print("⏳ Waiting for video downloads...")
+        _video_pool.shutdown(wait=True)
 
         browser.close()
 
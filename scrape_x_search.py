@@ -1,13 +1,23 @@
 import os
+import re
 import time
 import hashlib
 import base64
 import requests
 import json
+import functools
 import subprocess
+import sqlite3
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from playwright.sync_api import sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
 
 load_dotenv()
 
@@ -28,58 +38,166 @@ END_MONTH = int(os.getenv("X_END_MONTH"))
 END_DAY = int(os.getenv("X_END_DAY"))
 
 CHUNK_DAYS = 5  # Scrape in 5-day chunks
+# Date ranges searched at once, each in its own headless browser
+SEARCH_WORKERS = max(1, int(os.getenv("X_SEARCH_WORKERS", "1")))
 
 # Twitter search filter - Set to "false" to disable
 FILTER_REPLIES = os.getenv("X_FILTER_REPLIES", "true").lower() == "true"
+# Send attachments as raw multipart/form-data instead of base64 JSON.
+# Only enable this if your Memos server accepts multipart uploads.
+USE_MULTIPART = os.getenv("MEMOS_MULTIPART_UPLOAD", "false").lower() == "true"
+# Local cache of existing-memo signatures, reused across runs
+DEDUP_DB = "memos_dedup.db"
 # ---------------------
 
+def create_session_with_retries() -> requests.Session:
+    """Create a pooled requests session with automatic retries."""
+    session = requests.Session()
+    # Default allowed methods: POSTs are never replayed, so no double memos
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    # Sized for the upload pool and page prefetcher plus the main thread
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=32,
+        pool_maxsize=32,
+        pool_block=False,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Keep-alive connections shared by every Memos and image request
+SESSION = create_session_with_retries()
+
+# Attachment downloads, encoding and uploads run side by side in the
+# background, so the main thread only creates memos and scrolls
+UPLOAD_WORKERS = 4
+_upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+
+# Search browsers share existing_memos, so checking and claiming a
+# signature has to happen in one step
+_dedup_lock = threading.Lock()
+
+# Recently downloaded images kept for retweets and repeats of the same media
+IMAGE_CACHE_SIZE = 64
+
+_dedup_db = sqlite3.connect(DEDUP_DB)
+_dedup_db.execute(
+    "CREATE TABLE IF NOT EXISTS memo_sig ("
+    "host TEXT, name TEXT, sig BLOB, updated REAL, PRIMARY KEY (host, name))"
+)
+
+def text_signature(text):
+    """64-bit integer signature used for duplicate detection."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+def fetch_memo_page(headers, page_token, filter_expr=None):
+    """Fetch a single page of memos."""
+    params = {"pageSize": 150}
+    if page_token:
+        params["pageToken"] = page_token
+    if filter_expr:
+        params["filter"] = filter_expr
+
+    response = SESSION.get(
+        f"{MEMOS_URL}/api/v1/memos",
+        params=params,
+        headers=headers,
+        timeout=30
+    )
+    response.raise_for_status()
+    # Parse the bytes directly; no decoded str copy of the page
+    return json.loads(response.content)
+
 def fetch_existing_memos():
-    """Fetch all existing memos to check for duplicates."""
-    print("🔍 Fetching existing memos to prevent duplicates...")
-    existing = set()
-    page_token = None
+    """Fetch all existing memos to check for duplicates.
+
+    Signatures are cached in DEDUP_DB, so later runs only ask the server
+    for memos updated since the newest cached one. Page tokens are opaque,
+    so pages cannot be fetched in parallel; instead the next page is in
+    flight on the shared session while the current one is hashed.
+    """
+    rows = _dedup_db.execute(
+        "SELECT sig FROM memo_sig WHERE host=?", (MEMOS_URL,)
+    ).fetchall()
+    existing = {int.from_bytes(sig, "big") for (sig,) in rows}
+    since = _dedup_db.execute(
+        "SELECT MAX(updated) FROM memo_sig WHERE host=?", (MEMOS_URL,)
+    ).fetchone()[0]
+
+    if since:
+        print(f"🔍 Loaded {len(existing)} cached memos, fetching memos updated since then...")
+        filter_expr = f"updated_ts >= {int(since)}"
+    else:
+        print("🔍 Fetching existing memos to prevent duplicates...")
+        filter_expr = None
+
     page_count = 0
     max_pages = 150  # Safety limit
+    fetched = []
+    complete = False
 
     headers = {"Authorization": f"Bearer {MEMOS_TOKEN}"}
 
     try:
-        while page_count < max_pages:
-            page_count += 1
-            url = f"{MEMOS_URL}/api/v1/memos?pageSize=150"
-            if page_token:
-                url += f"&pageToken={page_token}"
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            future = prefetcher.submit(fetch_memo_page, headers, None, filter_expr)
+            while page_count < max_pages:
+                page_count += 1
+
+                try:
+                    data = future.result()
+                except requests.exceptions.HTTPError as e:
+                    if e.response.status_code == 400:
+                        if filter_expr and page_count == 1:
+                            print("  ⚠️ Server rejected the update filter, fetching all memos")
+                            filter_expr = None
+                            page_count = 0
+                            future = prefetcher.submit(fetch_memo_page, headers, None)
+                            continue
+                        print(f"  ⚠️ Pagination ended at page {page_count} (possibly last page)")
+                        break
+                    raise
 
-            try:
-                response = requests.get(url, headers=headers, timeout=30)
-                response.raise_for_status()
-
-                data = response.json()
                 memos = data.get("memos", [])
 
                 if not memos:
                     print(f"  📄 No more memos on page {page_count}")
+                    complete = True
                     break
 
+                page_token = data.get("nextPageToken")
+                if page_token and page_count < max_pages:
+                    future = prefetcher.submit(
+                        fetch_memo_page, headers, page_token, filter_expr
+                    )
+
                 for memo in memos:
                     content = memo.get("content", "")
                     if content:
-                        sig = hashlib.md5(content.encode()).hexdigest()
+                        sig = text_signature(content)
                         existing.add(sig)
+                        # Only what the cache needs; the page is dropped
+                        fetched.append((
+                            memo.get("name"),
+                            memo.get("updateTime") or memo.get("createTime"),
+                            sig
+                        ))
 
                 print(f"  📄 Fetched page {page_count} ({len(memos)} memos)")
 
-                page_token = data.get("nextPageToken")
                 if not page_token:
+                    complete = True
                     break
 
-                time.sleep(0.5)
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 400:
-                    print(f"  ⚠️ Pagination ended at page {page_count} (possibly last page)")
-                    break
-                raise
+        # Only a complete listing may move the cache's high-water mark
+        if complete:
+            save_memo_signatures(fetched)
 
         print(f"✅ Found {len(existing)} existing memos\n")
         return existing
@@ -89,6 +207,76 @@ def fetch_existing_memos():
         print("⚠️ Continuing without complete duplicate detection...\n")
         return existing  # Return what we have so far
 
+def save_memo_signatures(fetched):
+    """Store (name, update time, signature) rows in the dedup cache in one transaction."""
+    rows = []
+    for name, update_time, sig in fetched:
+        try:
+            updated = datetime.fromisoformat(update_time.replace("Z", "+00:00")).timestamp()
+        except (AttributeError, ValueError):
+            updated = 0
+        rows.append((MEMOS_URL, name, sig.to_bytes(8, "big"), updated))
+
+    with _dedup_db:
+        _dedup_db.executemany(
+            "INSERT OR REPLACE INTO memo_sig VALUES (?, ?, ?, ?)", rows
+        )
+
+def build_attachment_body(content, filename, mime_type, memo_name):
+    """Serialize the attachment JSON body without a base64 str copy."""
+    meta = json.dumps({"filename": filename, "type": mime_type, "memo": memo_name})
+    # Base64 output never needs JSON escaping, so splice the raw bytes in
+    return (
+        meta[:-1].encode("utf-8")
+        + b', "content": "'
+        + base64.b64encode(content)
+        + b'"}'
+    )
+
+class AttachmentBody:
+    """Attachment JSON body that base64-encodes a file as it is sent.
+
+    The encoded length is known up front, so requests sends a plain
+    Content-Length body rather than chunked transfer encoding.
+    """
+
+    # Multiples of 3 bytes encode without padding, so chunks concatenate
+    CHUNK_SIZE = 3 * 65536
+
+    def __init__(self, path, filename, mime_type, memo_name):
+        meta = json.dumps(
+            {"filename": filename, "type": mime_type, "memo": memo_name}
+        )
+        self.path = path
+        self.prefix = meta[:-1].encode("utf-8") + b', "content": "'
+        self.suffix = b'"}'
+        self.size = os.path.getsize(path)
+
+    def __len__(self):
+        encoded = 4 * ((self.size + 2) // 3)
+        return len(self.prefix) + encoded + len(self.suffix)
+
+    def __iter__(self):
+        yield self.prefix
+        with open(self.path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                yield base64.b64encode(chunk)
+        yield self.suffix
+
+@functools.lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def download_image(img_url):
+    """Download an image once per run; repeats reuse the cached bytes."""
+    # Stream the body; cached results are shared, so keep them immutable
+    with SESSION.get(img_url, timeout=15, stream=True) as resp:
+        resp.raise_for_status()
+        content = b"".join(resp.iter_content(chunk_size=65536))
+
+    filename = img_url.split("/")[-1].split("?")[0]
+    if not any(filename.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
+        filename += ".jpg"
+
+    return filename, content
+
 def upload_image_to_memos(img_url, memo_name):
     """Downloads image and uploads to Memos."""
     try:
@@ -96,28 +284,32 @@ def upload_image_to_memos(img_url, memo_name):
             img_url = img_url.split('?')[0]
         img_url += "?format=jpg&name=large"
 
-        resp = requests.get(img_url, timeout=15)
-        resp.raise_for_status()
-
-        filename = img_url.split("/")[-1].split("?")[0]
-        if not any(filename.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-            filename += ".jpg"
-
-        encoded = base64.b64encode(resp.content).decode("utf-8")
-
-        payload = {
-            "filename": filename,
-            "content": encoded,
-            "type": "image/jpeg",
-            "memo": memo_name
-        }
-
-        res = requests.post(
-            f"{MEMOS_URL}/api/v1/attachments",
-            json=payload,
-            headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
-            timeout=30
-        )
+        filename, content = download_image(img_url)
+
+        if USE_MULTIPART:
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                files={"file": (filename, content, "image/jpeg")},
+                data={
+                    "memo": memo_name,
+                    "filename": filename,
+                    "type": "image/jpeg"
+                },
+                headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
+                timeout=30
+            )
+        else:
+            body = build_attachment_body(content, filename, "image/jpeg", memo_name)
+
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                data=body,
+                headers={
+                    "Authorization": f"Bearer {MEMOS_TOKEN}",
+                    "Content-Type": "application/json"
+                },
+                timeout=30
+            )
         res.raise_for_status()
         return res.json().get("name")
 
@@ -134,20 +326,27 @@ def export_cookies_to_file(context):
         cookies = context.cookies()
         cookie_file = "twitter_cookies.txt"
 
-        with open(cookie_file, 'w') as f:
-            f.write("# Netscape HTTP Cookie File\n")
-            f.write("# This is a generated file! Do not edit.\n\n")
-
-            for cookie in cookies:
-                domain = cookie['domain']
-                flag = "TRUE" if domain.startswith('.') else "FALSE"
-                secure = "TRUE" if cookie['secure'] else "FALSE"
-                expiry = str(int(cookie.get('expires', 0))) if cookie.get('expires', 0) > 0 else "0"
-                path = cookie.get('path', '/')
-                name = cookie['name']
-                value = cookie['value']
+        lines = [
+            "# Netscape HTTP Cookie File",
+            "# This is a generated file! Do not edit.",
+            ""
+        ]
+        for cookie in cookies:
+            domain = cookie['domain']
+            flag = "TRUE" if domain.startswith('.') else "FALSE"
+            secure = "TRUE" if cookie['secure'] else "FALSE"
+            expires = cookie.get('expires', 0)
+            expiry = str(int(expires)) if expires > 0 else "0"
+            row = (domain, flag, cookie.get('path', '/'), secure, expiry, cookie['name'], cookie['value'])
+            # A tab or newline inside a field would shift every column after it
+            if any('\t' in field or '\n' in field or '\r' in field for field in row):
+                print(f"  ⚠️ Skipping cookie with unsupported characters: {cookie['name']!r}")
+                continue
+            lines.append("\t".join(row))
 
-                f.write(f"{domain}\t{flag}\t{path}\t{secure}\t{expiry}\t{name}\t{value}\n")
+        # One write for the whole file
+        with open(cookie_file, 'w') as f:
+            f.write("\n".join(lines) + "\n")
 
         print(f"  📄 Exported cookies for yt-dlp")
         return cookie_file
@@ -202,22 +401,32 @@ def upload_video_to_memos(video_path, memo_name):
         file_size = os.path.getsize(video_path)
         print(f"  📤 Uploading video ({file_size / 1024 / 1024:.2f} MB)...")
 
-        with open(video_path, 'rb') as f:
-            encoded = base64.b64encode(f.read()).decode("utf-8")
-
-        payload = {
-            "filename": os.path.basename(video_path),
-            "content": encoded,
-            "type": "video/mp4",
-            "memo": memo_name
-        }
-
-        res = requests.post(
-            f"{MEMOS_URL}/api/v1/attachments",
-            json=payload,
-            headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
-            timeout=120
-        )
+        filename = os.path.basename(video_path)
+
+        if USE_MULTIPART:
+            with open(video_path, 'rb') as f:
+                res = SESSION.post(
+                    f"{MEMOS_URL}/api/v1/attachments",
+                    files={"file": (filename, f, "video/mp4")},
+                    data={
+                        "memo": memo_name,
+                        "filename": filename,
+                        "type": "video/mp4"
+                    },
+                    headers={"Authorization": f"Bearer {MEMOS_TOKEN}"},
+                    timeout=120
+                )
+        else:
+            # Encoded and uploaded piece by piece instead of held in memory
+            res = SESSION.post(
+                f"{MEMOS_URL}/api/v1/attachments",
+                data=AttachmentBody(video_path, filename, "video/mp4", memo_name),
+                headers={
+                    "Authorization": f"Bearer {MEMOS_TOKEN}",
+                    "Content-Type": "application/json"
+                },
+                timeout=120
+            )
         res.raise_for_status()
 
         attachment_name = res.json().get("name")
@@ -238,6 +447,20 @@ def upload_video_to_memos(video_path, memo_name):
             except:
                 pass
 
+def attach_image(img_url, memo_name):
+    """Upload one tweet image to the memo and report the attachment."""
+    attachment = upload_image_to_memos(img_url, memo_name)
+    if attachment:
+        print(f"  📎 Attached: {attachment}")
+    return attachment
+
+def download_and_upload_video(video_url, memo_name, cookie_file=None):
+    """Download a tweet's video with yt-dlp and attach it to the memo."""
+    video_path = download_video_with_ytdlp(video_url, cookie_file)
+    if video_path:
+        return upload_video_to_memos(video_path, memo_name)
+    return None
+
 def create_memo(text, timestamp, images, video_url=None, cookie_file=None):
     """Creates the memo in your self-hosted instance with proper timestamp."""
     payload = {"content": text, "visibility": "PRIVATE"}
@@ -247,7 +470,7 @@ def create_memo(text, timestamp, images, video_url=None, cookie_file=None):
     }
 
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             f"{MEMOS_URL}/api/v1/memos",
             json=payload,
             headers=headers,
@@ -262,7 +485,7 @@ def create_memo(text, timestamp, images, video_url=None, cookie_file=None):
         if timestamp:
             patch_url = f"{MEMOS_URL}/api/v1/{memo_name}"
             patch_payload = {"createTime": timestamp}
-            patch_response = requests.patch(
+            patch_response = SESSION.patch(
                 patch_url,
                 json=patch_payload,
                 headers=headers,
@@ -274,21 +497,52 @@ def create_memo(text, timestamp, images, video_url=None, cookie_file=None):
             else:
                 print(f"  ⚠️ Timestamp update failed: {patch_response.status_code}")
 
-        for img_url in images:
-            attachment = upload_image_to_memos(img_url, memo_name)
-            if attachment:
-                print(f"  📎 Attached: {attachment}")
+        # Images and the video are independent, so upload them in parallel
+        # while the page keeps scrolling; scrape_x waits for them at the end
+        # A quoted tweet can repeat its media; attach each image once
+        for img_url in dict.fromkeys(images):
+            _upload_pool.submit(attach_image, img_url, memo_name)
 
         if video_url:
-            video_path = download_video_with_ytdlp(video_url, cookie_file)
-            if video_path:
-                upload_video_to_memos(video_path, memo_name)
+            _upload_pool.submit(
+                download_and_upload_video, video_url, memo_name, cookie_file
+            )
 
     except requests.RequestException as e:
         print(f"❌ Failed to create memo: {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
+class MemoWriter:
+    """Creates memos on a background thread so scrolling never waits.
+
+    The bounded queue applies backpressure when uploads fall behind.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize=32):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+            create_memo(*item)
+            time.sleep(0.5)
+
+    def submit(self, text, timestamp, images, video_url=None, cookie_file=None):
+        """Queue a scraped tweet, blocking while the queue is full."""
+        self.queue.put((text, timestamp, images, video_url, cookie_file))
+
+    def close(self):
+        """Wait for every queued memo to be created."""
+        self.queue.put(self._STOP)
+        self.thread.join()
+
 def create_auth_json(auth_token, ct0_token):
     """Creates auth.json from tokens."""
     auth_data = {
@@ -320,37 +574,85 @@ def create_auth_json(auth_token, ct0_token):
         json.dump(auth_data, f)
     print("✅ Created auth.json from tokens!")
 
-def parse_twitter_timestamp(time_element):
-    """Extract Twitter timestamp in ISO format."""
-    try:
-        datetime_attr = time_element.get_attribute("datetime")
-        if datetime_attr:
-            return datetime_attr
-        return None
-    except Exception as e:
-        print(f"  ⚠️ Failed to parse timestamp: {e}")
-        return None
-
-def extract_tweet_url(tweet_element):
-    """Extract the tweet URL from the tweet element."""
-    try:
-        link = tweet_element.locator('a[href*="/status/"]').first
-        if link.count() > 0:
-            href = link.get_attribute("href")
-            if href:
-                if href.startswith('/'):
-                    return f"https://x.com{href}"
-                return href
-    except Exception as e:
-        print(f"  ⚠️ Failed to extract tweet URL: {e}")
-    return None
-
-def is_tweet_in_date_range(timestamp_str, start_date, end_date):
-    """Verify tweet is actually within the expected date range."""
+TWEET_SELECTOR = 'article[data-testid="tweet"]'
+SELECTORS = {
+    "tweet": TWEET_SELECTOR,
+    "text": 'div[data-testid="tweetText"]',
+    "image": 'img[src*="pbs.twimg.com/media"]',
+    "time": "time",
+    "video": "video",
+    "link": 'a[href*="/status/"]',
+}
+
+# Reads every visible tweet in one call instead of a locator per field.
+# Status IDs are checked first, so tweets already read on an earlier
+# scroll cost one attribute lookup; tailHref is the last article's link.
+# The ID set lives on the page, so each new search starts empty.
+# Installed as an init script, so it is compiled once per page load
+# rather than on every scroll.
+EXTRACT_TWEETS_INIT_JS = """
+window.__extractTweets = sel => {
+    const seen = (window.__scrapedIds ??= new Set());
+    const articles = [...document.querySelectorAll(sel.tweet)];
+    const linkOf = a => a.querySelector(sel.link)?.getAttribute('href') || null;
+    const tweets = [];
+    for (const a of articles) {
+        const href = linkOf(a);
+        const statusId = href?.match(/\\/status\\/(\\d+)/)?.[1] || null;
+        if (statusId && seen.has(statusId)) continue;
+        const texts = [...a.querySelectorAll(sel.text)]
+            .map(n => n.innerText)
+            .filter(t => t);
+        // Tweets whose text has not rendered yet are read again next time
+        if (statusId && texts.length) seen.add(statusId);
+        tweets.push({
+            texts,
+            timestamp: a.querySelector(sel.time)?.getAttribute('datetime') || null,
+            images: [...a.querySelectorAll(sel.image)]
+                .map(i => i.getAttribute('src')),
+            hasVideo: !!a.querySelector(sel.video),
+            href,
+        });
+    }
+    const tail = articles[articles.length - 1];
+    return { tweets, tailHref: tail ? linkOf(tail) : null };
+};
+"""
+TWEETS_JS = "sel => window.__extractTweets(sel)"
+
+# True once the last tweet in the DOM is no longer the one seen before scrolling
+TIMELINE_ADVANCED_JS = """
+([sel, lastHref]) => {
+    const articles = document.querySelectorAll(sel.tweet);
+    const tail = articles[articles.length - 1];
+    const href = tail?.querySelector(sel.link)?.getAttribute('href') || null;
+    return !!tail && href !== lastHref;
+}
+"""
+SCROLL_WAIT_MS = 3000
+
+# X renders <time datetime="2024-05-01T12:34:56.000Z">; in that fixed UTC
+# form timestamps sort as strings, so the range check needs no parsing
+ISO_UTC_FORMAT = '%Y-%m-%dT%H:%M:%S.000Z'
+
+SEARCH_URL = "https://x.com/search?q={}&src=typed_query&f=live"
+
+# Tweet images and video segments; their URLs are read from the DOM and
+# fetched by the uploader, so the browser never needs the bytes
+MEDIA_URL_PATTERN = re.compile(r"^https://(pbs|video)\.twimg\.com/")
+
+def is_tweet_in_date_range(timestamp_str, start_iso, end_iso):
+    """Verify tweet is actually within the expected date range.
+
+    The bounds are UTC timestamps in ISO_UTC_FORMAT.
+    """
     try:
-        tweet_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        tweet_date = tweet_date.replace(tzinfo=None)
-        return start_date <= tweet_date < end_date
+        if not timestamp_str.endswith('Z'):
+            tweet_date = datetime.fromisoformat(timestamp_str)
+            if tweet_date.tzinfo:
+                tweet_date = tweet_date.astimezone(timezone.utc)
+            timestamp_str = tweet_date.strftime(ISO_UTC_FORMAT)
+        return start_iso <= timestamp_str < end_iso
     except Exception as e:
         print(f"  ⚠️ Error verifying date: {e}")
         return True
@@ -379,14 +681,13 @@ def wait_for_page_load(page, timeout=30):
         try:
             page.wait_for_selector(selector, timeout=timeout * 1000, state="visible")
             print(f"✅ Page loaded (detected: {name})")
-            time.sleep(2)  # Additional stabilization
             return True
         except Exception:
             continue
     
     return False
 
-def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=None):
+def scrape_date_range(page, writer, start_date, end_date, existing_memos, cookie_file=None):
     """Scrape tweets from a specific date range."""
     start_str = start_date.strftime('%Y-%m-%d')
     end_str = end_date.strftime('%Y-%m-%d')
@@ -396,7 +697,9 @@ def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=No
     if FILTER_REPLIES:
         search_query += " -filter:replies"
 
-    search_url = f"https://x.com/search?q={requests.utils.quote(search_query)}&src=typed_query&f=live"
+    search_url = SEARCH_URL.format(quote(search_query))
+    start_iso = start_date.strftime(ISO_UTC_FORMAT)
+    end_iso = end_date.strftime(ISO_UTC_FORMAT)
 
     print(f"\n{'='*60}")
     print(f"📅 SCRAPING: {start_str} → {end_str}")
@@ -443,8 +746,7 @@ def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=No
         return 0, 0, 0
 
     # Check if there are actually any tweets
-    tweets = page.locator('article[data-testid="tweet"]').all()
-    if len(tweets) == 0:
+    if page.locator(TWEET_SELECTOR).count() == 0:
         print("⚠️ No tweets found in this date range")
         
         # Check for "no results" message
@@ -465,24 +767,14 @@ def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=No
     no_new_scrolls = 0
 
     while scroll_attempts < MAX_SCROLLS:
-        tweets = page.locator('article[data-testid="tweet"]').all()
-        print(f"👀 Scanning {len(tweets)} visible tweets...")
+        scan = page.evaluate(TWEETS_JS, SELECTORS)
+        tweets = scan["tweets"]
+        print(f"👀 Scanning {len(tweets)} unseen tweets...")
 
         found_new = False
         for tweet in tweets:
             try:
-                text_elements = tweet.locator('div[data-testid="tweetText"]')
-                text_count = text_elements.count()
-
-                texts = []
-                for i in range(text_count):
-                    try:
-                        txt = text_elements.nth(i).inner_text()
-                        if txt:
-                            texts.append(txt)
-                    except:
-                        continue
-
+                texts = tweet["texts"]
                 if not texts:
                     continue
 
@@ -491,49 +783,45 @@ def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=No
                 else:
                     text = texts[0]
 
-                time_element = tweet.locator('time').first
-                timestamp = None
-                if time_element.count() > 0:
-                    timestamp = parse_twitter_timestamp(time_element)
-
+                timestamp = tweet["timestamp"]
                 if timestamp:
-                    if not is_tweet_in_date_range(timestamp, start_date, end_date):
+                    if not is_tweet_in_date_range(timestamp, start_iso, end_iso):
                         date_mismatch_count += 1
                         continue
 
-                content_sig = hashlib.md5(text.encode()).hexdigest()
+                content_sig = text_signature(text)
                 if content_sig in existing_memos:
                     duplicate_count += 1
                     continue
 
-                imgs_el = tweet.locator('img[src*="pbs.twimg.com/media"]')
-                images = [
-                    imgs_el.nth(i).get_attribute("src")
-                    for i in range(imgs_el.count())
-                ]
+                images = tweet["images"]
 
+                # yt-dlp needs the tweet URL to fetch the video
                 video_url = None
-                video_element = tweet.locator('video')
-                if video_element.count() > 0:
-                    tweet_url = extract_tweet_url(tweet)
-                    if tweet_url:
-                        video_url = tweet_url
-                        print(f"  🎬 Detected video in tweet")
+                href = tweet["href"]
+                if tweet["hasVideo"] and href:
+                    video_url = f"https://x.com{href}" if href.startswith('/') else href
+                    print(f"  🎬 Detected video in tweet")
 
-                sig = hashlib.md5(
-                    f"{text}{timestamp}{len(images)}{bool(video_url)}".encode()
-                ).hexdigest()
+                sig = text_signature(
+                    f"{text}{timestamp}{len(images)}{bool(video_url)}"
+                )
 
                 if sig not in seen_tweets:
                     seen_tweets.add(sig)
-                    existing_memos.add(content_sig)
+                    # Another browser may have claimed the same text since
+                    # the check above
+                    with _dedup_lock:
+                        if content_sig in existing_memos:
+                            duplicate_count += 1
+                            continue
+                        existing_memos.add(content_sig)
                     found_new = True
                     new_tweets += 1
                     print(f"📥 New [{new_tweets}]: {text[:50].replace(chr(10), ' ')}...")
                     if timestamp:
                         print(f"  📅 Date: {timestamp}")
-                    create_memo(text, timestamp, images, video_url, cookie_file)
-                    time.sleep(0.5)
+                    writer.submit(text, timestamp, images, video_url, cookie_file)
 
             except Exception as e:
                 print(f"⚠️ Error processing tweet: {e}")
@@ -559,7 +847,15 @@ def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=No
 
         page.evaluate("window.scrollBy(0, window.innerHeight)")
         print("⬇️ Scrolling...")
-        time.sleep(3)
+        # Continue as soon as new tweets render, at most the old 3 s
+        try:
+            page.wait_for_function(
+                TIMELINE_ADVANCED_JS,
+                arg=[SELECTORS, scan["tailHref"]],
+                timeout=SCROLL_WAIT_MS
+            )
+        except PlaywrightTimeoutError:
+            pass
         scroll_attempts += 1
 
     print(f"\n📊 Date Range Summary:")
@@ -570,6 +866,73 @@ def scrape_date_range(page, start_date, end_date, existing_memos, cookie_file=No
 
     return new_tweets, duplicate_count, 0
 
+def open_search_page(p, auth_file):
+    """Launch a headless browser logged in with auth_file and open a page."""
+    browser = p.chromium.launch(
+        headless=True,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox'
+        ]
+    )
+    context = browser.new_context(
+        storage_state=auth_file,
+        viewport={"width": 1920, "height": 1080},
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    # Set longer default timeout
+    context.set_default_timeout(10000)
+    # Runs on every navigation, so each searched range has the extractor
+    context.add_init_script(EXTRACT_TWEETS_INIT_JS)
+    # Only media hosts are routed, so scripts and API calls never make a
+    # round trip through Python
+    context.route(MEDIA_URL_PATTERN, lambda route: route.abort())
+    page = context.new_page()
+    return browser, context, page
+
+def scrape_queued_ranges(page, range_queue, total_ranges, writer, existing_memos, cookie_file=None):
+    """Scrape date ranges from the shared queue until it is empty.
+
+    Returns (range_start, range_end, new_count, dup_count) for each range
+    scraped; ranges that raised count as empty.
+    """
+    results = []
+    while True:
+        try:
+            idx, (range_start, range_end) = range_queue.get_nowait()
+        except queue.Empty:
+            return results
+
+        print(f"\n🔄 Progress: {idx}/{total_ranges} ranges")
+        try:
+            new_count, dup_count, _ = scrape_date_range(
+                page, writer, range_start, range_end, existing_memos, cookie_file
+            )
+        except Exception as e:
+            print(f"❌ Error scraping range: {e}")
+            new_count, dup_count = 0, 0
+        results.append((range_start, range_end, new_count, dup_count))
+
+        # Only back off when X came back empty or erroring, which
+        # is how rate limiting shows up in search results
+        if new_count == 0 and dup_count == 0 and not range_queue.empty():
+            print(f"\n⏳ Waiting 5 seconds before next range...")
+            time.sleep(5)
+
+def scrape_ranges_in_own_browser(auth_file, range_queue, total_ranges, writer, existing_memos, cookie_file=None):
+    """Run scrape_queued_ranges with a Playwright instance for this thread."""
+    # Playwright objects can't be shared across threads
+    with sync_playwright() as p:
+        browser, _, page = open_search_page(p, auth_file)
+        try:
+            return scrape_queued_ranges(
+                page, range_queue, total_ranges, writer, existing_memos, cookie_file
+            )
+        finally:
+            browser.close()
+
 def scrape_x():
     with sync_playwright() as p:
         auth_file = 'auth.json'
@@ -602,6 +965,8 @@ def scrape_x():
         print(f"Mode: ORIGINAL POSTS ONLY")
         if FILTER_REPLIES:
             print(f"🔍 Twitter filter: -filter:replies (native)")
+        if SEARCH_WORKERS > 1:
+            print(f"🧵 Parallel searches: {SEARCH_WORKERS}")
         print(f"{'='*60}\n")
 
         date_ranges = generate_date_ranges(start_date, end_date, CHUNK_DAYS)
@@ -610,49 +975,52 @@ def scrape_x():
         existing_memos = fetch_existing_memos()
 
         print("🕵️ Launching headless browser...")
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox'
-            ]
-        )
-        context = browser.new_context(
-            storage_state=auth_file,
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        
-        # Set longer default timeout
-        context.set_default_timeout(10000)
-        page = context.new_page()
+        browser, context, page = open_search_page(p, auth_file)
 
         cookie_file = export_cookies_to_file(context)
 
-        total_new = 0
-        total_duplicates = 0
-        failed_ranges = []
-
-        for idx, (range_start, range_end) in enumerate(date_ranges, 1):
-            print(f"\n🔄 Progress: {idx}/{len(date_ranges)} ranges")
-            try:
-                new_count, dup_count, _ = scrape_date_range(
-                    page, range_start, range_end, existing_memos, cookie_file
-                )
-                total_new += new_count
-                total_duplicates += dup_count
-                
-                if new_count == 0 and dup_count == 0:
-                    failed_ranges.append(f"{range_start.strftime('%Y-%m-%d')} → {range_end.strftime('%Y-%m-%d')}")
-                    
-            except Exception as e:
-                print(f"❌ Error scraping range: {e}")
-                failed_ranges.append(f"{range_start.strftime('%Y-%m-%d')} → {range_end.strftime('%Y-%m-%d')}")
+        # Every browser takes the next unscraped range when it is free
+        range_queue = queue.Queue()
+        for idx, date_range in enumerate(date_ranges, 1):
+            range_queue.put((idx, date_range))
+        extra_workers = min(SEARCH_WORKERS, len(date_ranges)) - 1
 
-            if idx < len(date_ranges):
-                print(f"\n⏳ Waiting 5 seconds before next range...")
-                time.sleep(5)
+        results = []
+        # Memos are created in the background while the page keeps scrolling
+        writer = MemoWriter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, extra_workers)) as search_pool:
+                futures = [
+                    search_pool.submit(
+                        scrape_ranges_in_own_browser, auth_file, range_queue,
+                        len(date_ranges), writer, existing_memos, cookie_file
+                    )
+                    for _ in range(extra_workers)
+                ]
+                try:
+                    results.extend(scrape_queued_ranges(
+                        page, range_queue, len(date_ranges), writer, existing_memos, cookie_file
+                    ))
+                except BaseException:
+                    # Empty the queue so the other browsers stop after their
+                    # current range instead of scraping everything left
+                    while True:
+                        try:
+                            range_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                    raise
+                for future in futures:
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        print(f"❌ Search worker failed: {e}")
+        finally:
+            # Queued memos submit their attachments, so drain them first;
+            # videos still downloading need the cookie file
+            print("\n⏳ Waiting for queued memos and attachment uploads...")
+            writer.close()
+            _upload_pool.shutdown(wait=True)
 
         if cookie_file and os.path.exists(cookie_file):
             try:
@@ -661,6 +1029,15 @@ def scrape_x():
             except:
                 pass
 
+        results.sort(key=lambda r: r[0])
+        total_new = sum(r[2] for r in results)
+        total_duplicates = sum(r[3] for r in results)
+        failed_ranges = [
+            f"{range_start.strftime('%Y-%m-%d')} → {range_end.strftime('%Y-%m-%d')}"
+            for range_start, range_end, new_count, dup_count in results
+            if new_count == 0 and dup_count == 0
+        ]
+
         print(f"\n{'='*60}")
         print(f"🎉 SCRAPING COMPLETE!")
         print(f"{'='*60}")